@@ -1,161 +1,66 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import os
+import sys
+
+# Thêm src/ vào sys.path để dùng package chung src/common/ khi chạy file trực tiếp
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fitness import batch_fitness
+from common.objectives import make_jcas_objective
+from common.observers import ConsoleReporter
+from common.physics import calculate_full_pattern
+from common.plotting import render_run, show_run
+from common.results import save_run
+from common.solvers import solve
 
 # ==========================================
 # CẤU HÌNH (SEED)
 # ==========================================
-np.random.seed(42) # Giữ cố định để kết quả lặp lại được
+SEED = 42 # Giữ cố định để kết quả lặp lại được (truyền vào solver qua rng)
 
 # ==========================================
 # 1. CÁC HÀM VẬT LÝ (PHYSICS LAYER)
 # ==========================================
-def get_steering_vector(theta_deg, N):
-    """Tạo vector lái pha"""
-    theta_rad = np.radians(theta_deg)
-    k = np.arange(N).reshape(-1, 1)
-    sv = np.exp(1j * np.pi * k * np.sin(theta_rad))
-    return sv
-
-def calculate_full_pattern(phases, N, resolution=1000):
-    """
-    Tính biểu đồ bức xạ từ các góc pha (Input của GWO là pha)
-    phases: Mảng 1 chiều chứa N góc pha
-    """
-    # Chuyển pha thành trọng số phức: w = e^(j*phi)
-    w = np.exp(1j * phases).reshape(-1, 1)
-    
-    angles = np.linspace(-90, 90, resolution)
-    k = np.arange(N).reshape(-1, 1)
-    theta_rads = np.radians(angles).reshape(1, -1)
-    A_scan = np.exp(1j * np.pi * k * np.sin(theta_rads))
-    
-    response = np.matmul(w.conj().T, A_scan)
-    gains = np.abs(response).flatten()
-    return angles, gains
+# get_steering_vector / steering_matrix / calculate_full_pattern nằm trong
+# src/common/physics.py (dùng chung, có lưu đệm ma trận lái).
 
 # ==========================================
 # 2. HÀM MỤC TIÊU (FITNESS FUNCTION)
 # ==========================================
 def fitness_function(phases, N, A_targets, d_mag):
-    """
-    Tính độ lệch (Error) của một con sói.
-    phases: Vị trí của sói (Vector các góc pha).
-    A_targets: Ma trận lái tại các hướng mục tiêu.
-    d_mag: Biên độ mong muốn tại các hướng mục tiêu.
-    """
-    # 1. Giải mã con sói: Pha -> Trọng số phức
-    w = np.exp(1j * phases).reshape(-1, 1)
-    
-    # 2. Tính phản hồi tại các hướng Target
-    y_current = np.matmul(A_targets.conj().T, w)
-    
-    # 3. Tính sai số (L2 Norm) giữa biên độ thực tế và mong muốn
-    # Fitness càng nhỏ càng tốt
-    error = np.linalg.norm(np.abs(y_current) - d_mag)
-    return error
+    """Sai số (L2) của một cấu hình pha; dùng chung common.fitness.batch_fitness."""
+    return batch_fitness(np.reshape(phases, (1, -1)), A_targets, d_mag)[0]
 
 # ==========================================
 # 3. THUẬT TOÁN GWO (CORE)
 # ==========================================
-def run_GWO_JCAS(N, target_angles, n_wolves=50, max_iter=100):
-    
-    # --- A. CHUẨN BỊ DỮ LIỆU ---
-    M = len(target_angles)
-    # Tạo ma trận lái tại các hướng Target (tính 1 lần dùng mãi mãi)
-    A_targets = np.hstack([get_steering_vector(ang, N) for ang in target_angles])
-    # Biên độ mong muốn (Gain = N)
-    d_mag = np.ones((M, 1)) * N
-    
-    # --- B. KHỞI TẠO BẦY SÓI ---
-    # LB = 0, UB = 2*pi (Góc pha từ 0 đến 2pi)
-    lb = 0
-    ub = 2 * np.pi
-    dim = N # Số chiều = Số ăng-ten
-    
-    # Vị trí bầy sói (n_wolves x 64)
-    Positions = np.random.uniform(0, 1, (n_wolves, dim)) * (ub - lb) + lb
-    
-    # Khởi tạo 3 con đầu đàn
-    Alpha_pos = np.zeros(dim)
-    Alpha_score = float("inf")
-    
-    Beta_pos = np.zeros(dim)
-    Beta_score = float("inf")
-    
-    Delta_pos = np.zeros(dim)
-    Delta_score = float("inf")
-    
-    convergence_curve = []
-    
-    print("-" * 60)
-    print(f"BẮT ĐẦU GWO CHO JCAS | Wolves={n_wolves} | Iterations={max_iter}")
-    print("-" * 60)
+def run_GWO_JCAS(N, target_angles, n_wolves=50, max_iter=100, vectorized=True, rng=None,
+                 phase_bits=None, memo_size=0, memo_quantum=None, callbacks=None, init=None,
+                 sidelobe_mode=None, sidelobe_weight=1.0, verbose=False):
+    """
+    Chạy GWO cho bài toán JCAS (vòng lặp nằm trong common/solvers.py, solver "gwo").
+    vectorized: True -> cập nhật cả bầy bằng phép toán mảng,
+                False -> dùng vòng lặp vô hướng cũ (để so sánh bit-for-bit)
+    rng: numpy.random.Generator hoặc seed (None -> ngẫu nhiên mỗi lần chạy)
+    phase_bits, memo_size, memo_quantum, sidelobe_mode, sidelobe_weight: cấu hình hàm mục tiêu
+        (pha lượng tử hoá / nhớ fitness / phạt búp phụ), xem common.objectives.make_jcas_objective.
+    callbacks: Observer theo dõi từng vòng lặp (ví dụ ConsoleReporter()); None -> không in.
+    verbose: True -> in thống kê memo sau khi chạy (mặc định không in gì).
+    init: Khởi tạo bầy: None (ngẫu nhiên), "ts_ils" hoặc mảng hạt giống (xem common/seeding.py).
+    Trả về: best_phases (Alpha_pos) và convergence_curve.
+    """
+    # Hàm mục tiêu: ma trận lái tại các hướng Target + biên độ mong muốn (Gain = N)
+    # LB = 0, UB = 2*pi (Góc pha từ 0 đến 2pi), Số chiều = Số ăng-ten
+    objective = make_jcas_objective(N, target_angles, phase_bits, memo_size, memo_quantum,
+                                    sidelobe_mode, sidelobe_weight)
 
-    # --- C. VÒNG LẶP SĂN MỒI ---
-    for l in range(0, max_iter):
-        
-        # 1. Đánh giá Fitness cho từng con sói
-        for i in range(0, n_wolves):
-            
-            # Xử lý biên (Nếu pha < 0 hoặc > 2pi thì ép lại, hoặc để tự do cũng được vì cos tuần hoàn)
-            # Nhưng để GWO ổn định, ta nên clip
-            Positions[i, :] = np.clip(Positions[i, :], lb, ub)
-            
-            # Tính điểm
-            fitness = fitness_function(Positions[i, :], N, A_targets, d_mag)
-            
-            # Cập nhật Alpha, Beta, Delta
-            if fitness < Alpha_score:
-                Alpha_score = fitness
-                Alpha_pos = Positions[i, :].copy()
-            elif fitness < Beta_score:
-                Beta_score = fitness
-                Beta_pos = Positions[i, :].copy()
-            elif fitness < Delta_score:
-                Delta_score = fitness
-                Delta_pos = Positions[i, :].copy()
-        
-        # 2. Cập nhật vị trí các con sói (GWO logic)
-        a = 2 - l * ((2) / max_iter) # a giảm từ 2 xuống 0
-        
-        for i in range(0, n_wolves):
-            for j in range(0, dim):
-                
-                # Sói Alpha
-                r1 = np.random.random()
-                r2 = np.random.random()
-                A1 = 2 * a * r1 - a
-                C1 = 2 * r2
-                D_alpha = abs(C1 * Alpha_pos[j] - Positions[i, j])
-                X1 = Alpha_pos[j] - A1 * D_alpha
-                
-                # Sói Beta
-                r1 = np.random.random()
-                r2 = np.random.random()
-                A2 = 2 * a * r1 - a
-                C2 = 2 * r2
-                D_beta = abs(C2 * Beta_pos[j] - Positions[i, j])
-                X2 = Beta_pos[j] - A2 * D_beta
-                
-                # Sói Delta
-                r1 = np.random.random()
-                r2 = np.random.random()
-                A3 = 2 * a * r1 - a
-                C3 = 2 * r2
-                D_delta = abs(C3 * Delta_pos[j] - Positions[i, j])
-                X3 = Delta_pos[j] - A3 * D_delta
-                
-                # Vị trí mới
-                Positions[i, j] = (X1 + X2 + X3) / 3
-        
-        # Lưu lịch sử
-        convergence_curve.append(Alpha_score)
-        
-        # In log ra terminal (Yêu cầu số 2)
-        print(f"Iter {l+1:03d}/{max_iter} | Best Fitness: {Alpha_score:.6f}")
+    # In log ra terminal (Yêu cầu số 2): truyền callbacks=ConsoleReporter()
+    result = solve("gwo", objective, n_wolves=n_wolves, max_iter=max_iter,
+                   vectorized=vectorized, rng=rng, callbacks=callbacks, init=init)
+    if memo_size and verbose:
+        info = objective.cache_info()
+        print(f"Memo: hits={info['hits']} | misses={info['misses']} | hit rate={info['hit_rate']:.1%}")
 
-    return Alpha_pos, convergence_curve
+    return result.best_position, result.convergence
 
 # ==========================================
 # 4. CHƯƠNG TRÌNH CHÍNH
@@ -169,44 +74,36 @@ if __name__ == "__main__":
     
     # --- Chạy GWO ---
     # Kết quả trả về là best_phases (Alpha_pos)
-    best_phases, costs = run_GWO_JCAS(N_ANTENNAS, TARGETS, n_wolves=N_WOLVES, max_iter=ITERATIONS)
-    
-    # --- Vẽ đồ thị (Yêu cầu số 3) ---
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    print("-" * 60)
+    print(f"BẮT ĐẦU GWO CHO JCAS | Wolves={N_WOLVES} | Iterations={ITERATIONS}")
+    print("-" * 60)
+    best_phases, costs = run_GWO_JCAS(N_ANTENNAS, TARGETS, n_wolves=N_WOLVES, max_iter=ITERATIONS,
+                                      rng=np.random.default_rng(SEED), callbacks=ConsoleReporter())
     
-    # HÌNH 1: Beam Pattern
+    # --- Lưu kết quả: pha, biểu đồ bức xạ, đường hội tụ ---
     angles, gains = calculate_full_pattern(best_phases, N_ANTENNAS)
-    gains_db = 20 * np.log10(gains / np.max(gains) + 1e-12)
-    
-    ax1.plot(angles, gains_db, linewidth=1.5, color='darkorange', label='GWO Optimized')
-    ax1.set_title(f'JCAS Beam Pattern (GWO, N={N_ANTENNAS})')
-    ax1.set_xlabel('Angle (degree)')
-    ax1.set_ylabel('Normalized Gain (dB)')
-    ax1.set_ylim([-60, 0])
-    ax1.grid(True, linestyle='--', alpha=0.6)
-    
-    for t in TARGETS:
-        ax1.axvline(x=t, color='red', linestyle=':', linewidth=1.5, label=f'Target {t}')
-    ax1.legend()
-
-    # HÌNH 2: Convergence Curve
-    ax2.plot(range(1, ITERATIONS + 1), costs, marker='.', markersize=6, color='purple', linewidth=1.5)
-    ax2.set_title('Convergence Curve (GWO)')
-    ax2.set_xlabel('Iteration (Vòng lặp)')
-    ax2.set_ylabel('Fitness Value (Error)')
-    ax2.grid(True)
-    
-    # --- Lưu file (Yêu cầu số 4) ---
     current_script_path = os.path.dirname(os.path.abspath(__file__))
+    # Dữ liệu chạy (.npz + .json) nằm trong runs/ (không đưa vào git), ảnh vẫn cạnh script
+    run = save_run(os.path.join(current_script_path, "runs", "GWO_in_JCAS_result"),
+                   meta={"solver": "gwo", "N": N_ANTENNAS, "targets": TARGETS, "seed": SEED,
+                         "plot": {"pattern_title": "JCAS Beam Pattern (GWO, N={N})",
+                                  "pattern_color": "darkorange", "pattern_label": "GWO Optimized",
+                                  "conv_title": "Convergence Curve (GWO)", "conv_color": "purple",
+                                  "conv_xlabel": "Iteration (Vòng lặp)",
+                                  "conv_ylabel": "Fitness Value (Error)",
+                                  "conv_start": 1, "markersize": 6, "linewidth": 1.5}},
+                   best_phases=best_phases, angles=angles, gains=gains, convergence=np.array(costs))
+    
+    # --- Vẽ đồ thị (Yêu cầu số 3) + Lưu file (Yêu cầu số 4) ---
     filename = "GWO_in_JCAS_result.png"
     full_save_path = os.path.join(current_script_path, filename)
-    
-    plt.tight_layout()
-    plt.savefig(full_save_path, dpi=300)
+    render_run(run, output=full_save_path, dpi=300)
     
     print("\n" + "="*60)
     print(f"[HOÀN THÀNH] Đã chạy xong GWO.")
     print(f"Ảnh kết quả đã được lưu tại: {full_save_path}")
     print("="*60)
     
-    plt.show()
\ No newline at end of file
+    # Mở cửa sổ xem hình khi chạy với tham số --show
+    if "--show" in sys.argv[1:]:
+        show_run(run)
@@ -1,189 +1,64 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import os
+import sys
+
+# Thêm src/ vào sys.path để dùng package chung src/common/ khi chạy file trực tiếp
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fitness import batch_fitness
+from common.objectives import make_jcas_objective
+from common.observers import ConsoleReporter
+from common.physics import calculate_full_pattern
+from common.plotting import render_run, show_run
+from common.results import save_run
+from common.solvers import solve
 
 # ==========================================
 # CẤU HÌNH (SEED)
 # ==========================================
-np.random.seed(42) # Giữ cố định để kết quả ổn định
+SEED = 42 # Giữ cố định để kết quả ổn định (truyền vào solver qua rng)
 
 # ==========================================
 # 1. CÁC HÀM VẬT LÝ (PHYSICS LAYER)
 # ==========================================
-def get_steering_vector(theta_deg, N):
-    """Tạo vector lái pha"""
-    theta_rad = np.radians(theta_deg)
-    k = np.arange(N).reshape(-1, 1)
-    sv = np.exp(1j * np.pi * k * np.sin(theta_rad))
-    return sv
-
-def calculate_full_pattern(phases, N, resolution=1000):
-    """
-    Tính biểu đồ bức xạ từ các góc pha.
-    phases: Mảng 1 chiều chứa N góc pha.
-    """
-    # Chuyển pha thành trọng số phức: w = e^(j*phi)
-    w_complex = np.exp(1j * phases).reshape(-1, 1)
-    
-    angles = np.linspace(-90, 90, resolution)
-    k = np.arange(N).reshape(-1, 1)
-    theta_rads = np.radians(angles).reshape(1, -1)
-    A_scan = np.exp(1j * np.pi * k * np.sin(theta_rads))
-    
-    response = np.matmul(w_complex.conj().T, A_scan)
-    gains = np.abs(response).flatten()
-    return angles, gains
+# get_steering_vector / steering_matrix / calculate_full_pattern nằm trong
+# src/common/physics.py (dùng chung, có lưu đệm ma trận lái).
 
 # ==========================================
 # 2. HÀM MỤC TIÊU (FITNESS FUNCTION)
 # ==========================================
 def fitness_function(phases, A_targets, d_mag):
-    """
-    Tính độ lệch (Error) của cấu hình pha.
-    """
-    w_complex = np.exp(1j * phases).reshape(-1, 1)
-    
-    # Tính phản hồi tại các hướng Target
-    y_current = np.matmul(A_targets.conj().T, w_complex)
-    
-    # Tính sai số biên độ (L2 Norm)
-    error = np.linalg.norm(np.abs(y_current) - d_mag)
-    return error
+    """Sai số (L2) của một cấu hình pha; dùng chung common.fitness.batch_fitness."""
+    return batch_fitness(np.reshape(phases, (1, -1)), A_targets, d_mag)[0]
 
 # ==========================================
 # 3. THUẬT TOÁN HYBRID GWO-PSO (CORE)
 # ==========================================
-def run_Hybrid_GWO_PSO_JCAS(N, target_angles, n_wolves=30, max_iter=50):
-    
-    # --- A. CHUẨN BỊ DỮ LIỆU ---
-    M = len(target_angles)
-    A_targets = np.hstack([get_steering_vector(ang, N) for ang in target_angles])
-    d_mag = np.ones((M, 1)) * N
-    
-    # --- B. KHỞI TẠO PARAMETERS ---
-    lb = 0
-    ub = 2 * np.pi
-    dim = N
-    
-    # PSO Parameters
-    w_pso = 0.5    # Inertia weight
-    c1 = 1.5       # Hệ số hướng về Alpha
-    c2 = 1.5       # Hệ số hướng về Beta
-    
-    # Khởi tạo Vị trí (X) và Vận tốc (V)
-    Positions = np.random.uniform(0, 1, (n_wolves, dim)) * (ub - lb) + lb
-    Velocities = np.zeros((n_wolves, dim))
-    
-    # Khởi tạo Alpha, Beta, Delta
-    Alpha_pos = np.zeros(dim)
-    Alpha_score = float("inf")
-    
-    Beta_pos = np.zeros(dim)
-    Beta_score = float("inf")
-    
-    Delta_pos = np.zeros(dim)
-    Delta_score = float("inf")
-    
-    convergence_curve = []
-    
-    # Đánh giá ban đầu
-    for i in range(n_wolves):
-        fitness = fitness_function(Positions[i, :], A_targets, d_mag)
-        if fitness < Alpha_score:
-            Alpha_score = fitness
-            Alpha_pos = Positions[i, :].copy()
-        elif fitness < Beta_score:
-            Beta_score = fitness
-            Beta_pos = Positions[i, :].copy()
-        elif fitness < Delta_score:
-            Delta_score = fitness
-            Delta_pos = Positions[i, :].copy()
-            
-    print("-" * 70)
-    print(f"BẮT ĐẦU HYBRID GWO-PSO | Wolves={n_wolves} | Iter={max_iter}")
-    print("-" * 70)
+def run_Hybrid_GWO_PSO_JCAS(N, target_angles, n_wolves=30, max_iter=50, rng=None,
+                            phase_bits=None, memo_size=0, memo_quantum=None, callbacks=None,
+                            init=None, sidelobe_mode=None, sidelobe_weight=1.0, verbose=False):
+    """
+    Chạy Hybrid GWO-PSO cho bài toán JCAS (vòng lặp nằm trong common/solvers.py,
+    solver "gwo_pso", tham số PSO: w = 0.5, c1 = c2 = 1.5).
+    rng: numpy.random.Generator hoặc seed (None -> ngẫu nhiên mỗi lần chạy).
+    phase_bits, memo_size, memo_quantum, sidelobe_mode, sidelobe_weight: cấu hình hàm mục tiêu
+        (pha lượng tử hoá / nhớ fitness / phạt búp phụ), xem common.objectives.make_jcas_objective.
+    callbacks: Observer theo dõi từng vòng lặp (ví dụ ConsoleReporter()); None -> không in.
+    verbose: True -> in thống kê memo sau khi chạy (mặc định không in gì).
+    init: Khởi tạo bầy: None (ngẫu nhiên), "ts_ils" hoặc mảng hạt giống (xem common/seeding.py).
+    Trả về: best_phases (Alpha_pos) và convergence_curve.
+    """
+    # Hàm mục tiêu: ma trận lái tại các hướng Target + biên độ mong muốn (Gain = N)
+    objective = make_jcas_objective(N, target_angles, phase_bits, memo_size, memo_quantum,
+                                    sidelobe_mode, sidelobe_weight)
 
-    # --- C. VÒNG LẶP SĂN MỒI ---
-    for l in range(0, max_iter):
-        
-        # Cập nhật tham số a (giảm tuyến tính từ 2 về 0)
-        a = 2 - l * ((2) / max_iter)
-        
-        for i in range(0, n_wolves):
-            # ==========================================
-            # PHASE 1: GREY WOLF UPDATING (Tính X_GWO)
-            # ==========================================
-            # Alpha
-            r1 = np.random.random(dim)
-            r2 = np.random.random(dim)
-            A1 = 2 * a * r1 - a
-            C1 = 2 * r2
-            D_alpha = np.abs(C1 * Alpha_pos - Positions[i, :])
-            X1 = Alpha_pos - A1 * D_alpha
-            
-            # Beta
-            r1 = np.random.random(dim)
-            r2 = np.random.random(dim)
-            A2 = 2 * a * r1 - a
-            C2 = 2 * r2
-            D_beta = np.abs(C2 * Beta_pos - Positions[i, :])
-            X2 = Beta_pos - A2 * D_beta
-            
-            # Delta
-            r1 = np.random.random(dim)
-            r2 = np.random.random(dim)
-            A3 = 2 * a * r1 - a
-            C3 = 2 * r2
-            D_delta = np.abs(C3 * Delta_pos - Positions[i, :])
-            X3 = Delta_pos - A3 * D_delta
-            
-            # Vị trí dự đoán theo GWO
-            X_GWO = (X1 + X2 + X3) / 3.0
-            
-            # ==========================================
-            # PHASE 2: PSO VELOCITY UPDATE (Tính X_PSO)
-            # ==========================================
-            r1_pso = np.random.random(dim)
-            r2_pso = np.random.random(dim)
-            
-            # Cập nhật vận tốc (Dùng Alpha và Beta để dẫn đường)
-            Velocities[i, :] = (w_pso * Velocities[i, :] + 
-                                c1 * r1_pso * (Alpha_pos - Positions[i, :]) + 
-                                c2 * r2_pso * (Beta_pos - Positions[i, :]))
-            
-            # Vị trí dự đoán theo PSO
-            X_PSO = Positions[i, :] + Velocities[i, :]
-            
-            # ==========================================
-            # PHASE 3: HYBRID COMBINATION & BOUND CHECK
-            # ==========================================
-            # Kết hợp 50-50
-            Positions[i, :] = 0.5 * X_GWO + 0.5 * X_PSO
-            
-            # Kiểm tra biên (0 đến 2pi)
-            Positions[i, :] = np.clip(Positions[i, :], lb, ub)
-            
-        # --- Đánh giá lại Fitness ---
-        for i in range(n_wolves):
-            fitness = fitness_function(Positions[i, :], A_targets, d_mag)
-            
-            if fitness < Alpha_score:
-                Alpha_score = fitness
-                Alpha_pos = Positions[i, :].copy()
-            elif fitness < Beta_score:
-                Beta_score = fitness
-                Beta_pos = Positions[i, :].copy()
-            elif fitness < Delta_score:
-                Delta_score = fitness
-                Delta_pos = Positions[i, :].copy()
-        
-        # Lưu lịch sử
-        convergence_curve.append(Alpha_score)
-        
-        # [YÊU CẦU 2] In rõ từng bước ra terminal
-        print(f"Iter {l+1:03d}/{max_iter} | Best Fitness (Error): {Alpha_score:.6f}")
+    # [YÊU CẦU 2] In rõ từng bước ra terminal: truyền callbacks=ConsoleReporter()
+    result = solve("gwo_pso", objective, n_wolves=n_wolves, max_iter=max_iter, rng=rng,
+                   callbacks=callbacks, init=init)
+    if memo_size and verbose:
+        info = objective.cache_info()
+        print(f"Memo: hits={info['hits']} | misses={info['misses']} | hit rate={info['hit_rate']:.1%}")
 
-    return Alpha_pos, convergence_curve
+    return result.best_position, result.convergence
 
 # ==========================================
 # 4. CHƯƠNG TRÌNH CHÍNH
@@ -196,34 +71,13 @@ if __name__ == "__main__":
     N_WOLVES = 30       
     
     # [YÊU CẦU 1] Chạy Hybrid GWO-PSO thay vì TS-ILS
-    best_phases, costs = run_Hybrid_GWO_PSO_JCAS(N_ANTENNAS, TARGETS, n_wolves=N_WOLVES, max_iter=ITERATIONS)
-    
-    # [YÊU CẦU 3] Vẽ 2 ảnh (Beam Pattern & Convergence)
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-    
-    # HÌNH 1: Beam Pattern
-    angles, gains = calculate_full_pattern(best_phases, N_ANTENNAS)
-    gains_db = 20 * np.log10(gains / np.max(gains) + 1e-12)
-    
-    ax1.plot(angles, gains_db, linewidth=1.5, color='magenta', label='Hybrid GWO-PSO')
-    ax1.set_title(f'JCAS Beam Pattern (Hybrid GWO-PSO, N={N_ANTENNAS})')
-    ax1.set_xlabel('Angle (degree)')
-    ax1.set_ylabel('Normalized Gain (dB)')
-    ax1.set_ylim([-60, 0])
-    ax1.grid(True, linestyle='--', alpha=0.6)
-    
-    for t in TARGETS:
-        ax1.axvline(x=t, color='red', linestyle=':', linewidth=1.5, label=f'Target {t}')
-    ax1.legend()
-
-    # HÌNH 2: Convergence Curve
-    ax2.plot(range(1, ITERATIONS + 1), costs, marker='.', markersize=6, color='darkblue', linewidth=1.5)
-    ax2.set_title('Convergence Curve (Hybrid GWO-PSO)')
-    ax2.set_xlabel('Iteration (Vòng lặp)')
-    ax2.set_ylabel('Fitness Value (Error)')
-    ax2.grid(True)
+    print("-" * 70)
+    print(f"BẮT ĐẦU HYBRID GWO-PSO | Wolves={N_WOLVES} | Iter={ITERATIONS}")
+    print("-" * 70)
+    best_phases, costs = run_Hybrid_GWO_PSO_JCAS(N_ANTENNAS, TARGETS, n_wolves=N_WOLVES, max_iter=ITERATIONS,
+                                                 rng=np.random.default_rng(SEED),
+                                                 callbacks=ConsoleReporter())
     
-    # [YÊU CẦU 4] Lưu file ảnh với tên cố định
     # --- CƠ CHẾ TÌM ĐƯỜNG DẪN TUYỆT ĐỐI ---
     try:
         # Cách 1: Thử lấy đường dẫn của file script đang chạy
@@ -231,16 +85,31 @@ if __name__ == "__main__":
     except NameError:
         # Cách 2: Nếu chạy trong môi trường tương tác (như Jupyter), dùng thư mục làm việc hiện tại
         current_dir = os.getcwd()
-        
+    
+    # Lưu kết quả (pha, biểu đồ bức xạ, đường hội tụ); việc vẽ đọc lại từ đây
+    angles, gains = calculate_full_pattern(best_phases, N_ANTENNAS)
+    # Dữ liệu chạy (.npz + .json) nằm trong runs/ (không đưa vào git), ảnh vẫn cạnh script
+    run = save_run(os.path.join(current_dir, "runs", "GWO_PSO_in_JCAS_result"),
+                   meta={"solver": "gwo_pso", "N": N_ANTENNAS, "targets": TARGETS, "seed": SEED,
+                         "plot": {"pattern_title": "JCAS Beam Pattern (Hybrid GWO-PSO, N={N})",
+                                  "pattern_color": "magenta", "pattern_label": "Hybrid GWO-PSO",
+                                  "conv_title": "Convergence Curve (Hybrid GWO-PSO)",
+                                  "conv_color": "darkblue", "conv_xlabel": "Iteration (Vòng lặp)",
+                                  "conv_ylabel": "Fitness Value (Error)",
+                                  "conv_start": 1, "markersize": 6, "linewidth": 1.5}},
+                   best_phases=best_phases, angles=angles, gains=gains, convergence=np.array(costs))
+    
+    # [YÊU CẦU 3] Vẽ 2 ảnh (Beam Pattern & Convergence)
+    # [YÊU CẦU 4] Lưu file ảnh với tên cố định
     filename = "GWO_PSO_in_JCAS_result.png"
     full_save_path = os.path.join(current_dir, filename)
-    
-    plt.tight_layout()
-    plt.savefig(full_save_path, dpi=300)
+    render_run(run, output=full_save_path, dpi=300)
     
     print("\n" + "="*70)
     print(f"[THÀNH CÔNG] Ảnh đã được lưu tại:")
     print(f"{full_save_path}")  # <--- HÃY COPY ĐƯỜNG DẪN NÀY DÁN VÀO FILE EXPLORER
     print("="*70)
     
-    plt.show()
\ No newline at end of file
+    # Mở cửa sổ xem hình khi chạy với tham số --show
+    if "--show" in sys.argv[1:]:
+        show_run(run)
@@ -1,5 +1,12 @@
+import os
+import sys
 import numpy as np
 
+# Thêm src/ vào sys.path để dùng package chung src/common/ khi chạy file trực tiếp
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.observers import ConsoleReporter
+from common.solvers import solve
+
 # ======================================================
 # PHẦN 1: HÀM MỤC TIÊU (PLACEHOLDER)
 # ======================================================
@@ -8,140 +15,31 @@ def fitness_function(position):
     Hàm này nhận vào vị trí (bộ tham số).
     Trả về: Điểm số (Fitness).
     Hiện tại trả về tổng bình phương (Sphere function) để test.
+    Nhận được cả ma trận (n_wolves x dim) -> trả về fitness của từng hàng.
     """
-    return np.sum(position**2)
+    return np.sum(position**2, axis=-1)
 
 # ======================================================
 # PHẦN 2: THUẬT TOÁN HYBRID GWO-PSO
 # ======================================================
-def Hybrid_GWO_PSO(N_WOLVES, MAX_ITER, DIM, LB, UB):
+def Hybrid_GWO_PSO(N_WOLVES, MAX_ITER, DIM, LB, UB, rng=None, callbacks=None):
     """
     Phiên bản lai ghép: Vừa bao vây (GWO) vừa có quán tính (PSO)
-    """
-    
-    # --- 1. Initialize parameters ---
-    # PSO parameters
-    w = 0.5      # Trọng số quán tính (Inertia weight)
-    c1 = 1.5     # Hệ số học tập 1
-    c2 = 1.5     # Hệ số học tập 2
-    
-    # --- 2. Randomly initialize wolf positions and velocities ---
-    # Vị trí X
-    Positions = np.random.uniform(0, 1, (N_WOLVES, DIM)) * (UB - LB) + LB
-    # Vận tốc V (Khởi tạo bằng 0 hoặc random nhỏ)
-    Velocities = np.zeros((N_WOLVES, DIM))
-    
-    # Khởi tạo Alpha, Beta, Delta
-    Alpha_pos = np.zeros(DIM)
-    Alpha_score = float("inf")
-    
-    Beta_pos = np.zeros(DIM)
-    Beta_score = float("inf")
-    
-    Delta_pos = np.zeros(DIM)
-    Delta_score = float("inf")
-    
-    # Tính fitness ban đầu để tìm Alpha, Beta, Delta
-    for i in range(N_WOLVES):
-        fitness = fitness_function(Positions[i, :])
-        if fitness < Alpha_score:
-            Alpha_score = fitness
-            Alpha_pos = Positions[i, :].copy()
-        elif fitness < Beta_score:
-            Beta_score = fitness
-            Beta_pos = Positions[i, :].copy()
-        elif fitness < Delta_score:
-            Delta_score = fitness
-            Delta_pos = Positions[i, :].copy()
+    rng: numpy.random.Generator hoặc seed (None -> ngẫu nhiên mỗi lần chạy)
+    callbacks: Observer theo dõi từng vòng lặp (ví dụ ConsoleReporter()); None -> không in
 
-    print("BẮT ĐẦU HYBRID GWO-PSO...")
-    
-    # --- 3. Main Loop (For iter = 1 to MAX_ITER) ---
-    for l in range(0, MAX_ITER):
-        
-        # Update control parameter a (decrease from 2 to 0)
-        a = 2 - l * ((2) / MAX_ITER)
-        
-        # For each wolf i
-        for i in range(0, N_WOLVES):
-            
-            # Để tối ưu tốc độ Python, ta xử lý nguyên mảng (vectorization)
-            # thay vì for j in range(DIM). Logic toán học vẫn y hệt.
-            
-            # ==========================================
-            # PHASE 1: GREY WOLF UPDATING (Tính X_GWO)
-            # ==========================================
-            
-            # --- Alpha ---
-            r1 = np.random.random(DIM)
-            r2 = np.random.random(DIM)
-            A1 = 2 * a * r1 - a
-            C1 = 2 * r2
-            D_alpha = np.abs(C1 * Alpha_pos - Positions[i, :])
-            X1 = Alpha_pos - A1 * D_alpha
-            
-            # --- Beta ---
-            r1 = np.random.random(DIM)
-            r2 = np.random.random(DIM)
-            A2 = 2 * a * r1 - a
-            C2 = 2 * r2
-            D_beta = np.abs(C2 * Beta_pos - Positions[i, :])
-            X2 = Beta_pos - A2 * D_beta
-            
-            # --- Delta ---
-            r1 = np.random.random(DIM)
-            r2 = np.random.random(DIM)
-            A3 = 2 * a * r1 - a
-            C3 = 2 * r2
-            D_delta = np.abs(C3 * Delta_pos - Positions[i, :])
-            X3 = Delta_pos - A3 * D_delta
-            
-            # Estimate new GWO position
-            X_GWO = (X1 + X2 + X3) / 3.0
-            
-            # ==========================================
-            # PHASE 2: PSO VELOCITY UPDATE (Tính X_PSO)
-            # ==========================================
-            
-            r1_pso = np.random.random(DIM)
-            r2_pso = np.random.random(DIM)
-            
-            # Cập nhật vận tốc dựa trên Alpha và Beta (theo mã giả)
-            # V = w*V + c1*r1*(Alpha - X) + c2*r2*(Beta - X)
-            Velocities[i, :] = (w * Velocities[i, :] + 
-                                c1 * r1_pso * (Alpha_pos - Positions[i, :]) + 
-                                c2 * r2_pso * (Beta_pos - Positions[i, :]))
-            
-            # Tính vị trí theo PSO
-            X_PSO = Positions[i, :] + Velocities[i, :]
-            
-            # ==========================================
-            # PHASE 3: HYBRID COMBINATION
-            # ==========================================
-            
-            # Kết hợp 50-50
-            Positions[i, :] = 0.5 * X_GWO + 0.5 * X_PSO
-            
-            # Bound control (Kiểm tra biên)
-            Positions[i, :] = np.clip(Positions[i, :], LB, UB)
-            
-        # --- Evaluate new fitness & Update Leaders ---
-        for i in range(0, N_WOLVES):
-            fitness = fitness_function(Positions[i, :])
-            
-            if fitness < Alpha_score:
-                Alpha_score = fitness
-                Alpha_pos = Positions[i, :].copy()
-            elif fitness < Beta_score:
-                Beta_score = fitness
-                Beta_pos = Positions[i, :].copy()
-            elif fitness < Delta_score:
-                Delta_score = fitness
-                Delta_pos = Positions[i, :].copy()
-                
-        print(f"Vòng lặp {l+1}: Best Fitness = {Alpha_score}")
+    Các bước (nằm trong solver "gwo_pso" của common/solvers.py):
+      1. Initialize parameters: w = 0.5 (quán tính), c1 = c2 = 1.5 (hệ số học tập)
+      2. Randomly initialize wolf positions and velocities, tìm Alpha, Beta, Delta
+      3. Main Loop: X_GWO (bao vây), X_PSO (vận tốc dẫn bởi Alpha, Beta),
+         kết hợp 50-50, kiểm tra biên, đánh giá lại và cập nhật đầu đàn
+    """
+    # fitness_function đã nhận được cả ma trận (n_wolves x dim)
+    result = solve("gwo_pso", fitness_function, DIM, LB, UB,
+                   n_wolves=N_WOLVES, max_iter=MAX_ITER,
+                   w_pso=0.5, c1=1.5, c2=1.5, rng=rng, callbacks=callbacks)
 
-    return Alpha_pos, Alpha_score
+    return result.best_position, result.best_score
 
 # ======================================================
 # CHẠY THỬ
@@ -154,7 +52,9 @@ if __name__ == "__main__":
     lb = -10            
     ub = 10             
     
-    best_pos, best_score = Hybrid_GWO_PSO(n_wolves, max_iter, dim, lb, ub)
+    print("BẮT ĐẦU HYBRID GWO-PSO...")
+    best_pos, best_score = Hybrid_GWO_PSO(n_wolves, max_iter, dim, lb, ub,
+                                          callbacks=ConsoleReporter())
     
     print("-" * 30)
     print(f"Kết quả Hybrid GWO-PSO:")
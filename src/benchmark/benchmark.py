@@ -0,0 +1,202 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# Thêm src/ vào sys.path để dùng package chung src/common/ khi chạy file trực tiếp
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.objectives import JCASObjective
+from common.physics import clear_physics_cache
+from common.profiling import Profiler
+from common.solvers import solve
+
+# ==========================================
+# BENCHMARK: TS-ILS vs GWO vs GWO-PSO
+# ==========================================
+# Đo trực tiếp các solver trong registry - chính là lõi của
+# optimize_jcas_ts_ils_original ("ts_ils"), run_GWO_JCAS ("gwo")
+# và run_Hybrid_GWO_PSO_JCAS ("gwo_pso"), nhưng không in log / vẽ hình.
+
+# Ghi vào thư mục làm việc hiện tại (không ghi vào cây mã nguồn)
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+# Các trường dùng để ghép kết quả mới với baseline
+CASE_KEYS = ("solver", "N", "M", "n_wolves", "max_iter")
+
+
+def target_angles(M):
+    """Bộ góc mục tiêu chuẩn cho M hướng (trải đều trong [-60, 60] độ)."""
+    if M == 1:
+        return [0.0]
+    return [float(a) for a in np.linspace(-60, 60, M)]
+
+
+def _run(solver, objective, n_wolves, max_iter, seed, profiler=None):
+    options = {"max_iter": max_iter, "rng": seed, "profiler": profiler}
+    if solver != "ts_ils":
+        options["n_wolves"] = n_wolves
+    return solve(solver, objective, **options)
+
+
+def benchmark_case(solver, N, M, n_wolves, max_iter, repeats=3, seed=0, profile=False):
+    """
+    Đo một cấu hình: thời gian (trung vị của `repeats` lần), số lần đánh giá
+    fitness mỗi giây, bộ nhớ đỉnh (tracemalloc, chạy riêng một lần) và sai số cuối.
+    profile=True: chạy thêm một lần với Profiler, thêm "profile" (tỉ lệ thời gian
+    từng pha + bộ đếm) vào kết quả.
+    """
+    times = []
+    for r in range(repeats):
+        clear_physics_cache()
+        objective = JCASObjective(N, target_angles(M))
+        result = _run(solver, objective, n_wolves, max_iter, seed + r)
+        times.append(result.elapsed)
+    wall_time = float(np.median(times))
+
+    # Lần chạy riêng để đo bộ nhớ (tracemalloc làm chậm nên không tính giờ)
+    clear_physics_cache()
+    tracemalloc.start()
+    objective = JCASObjective(N, target_angles(M))
+    result = _run(solver, objective, n_wolves, max_iter, seed)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    record = {
+        "solver": solver,
+        "N": N,
+        "M": M,
+        "n_wolves": n_wolves if solver != "ts_ils" else 1,
+        "max_iter": max_iter,
+        "wall_time": wall_time,
+        "n_evals": result.n_evals,
+        "evals_per_sec": result.n_evals / wall_time if wall_time > 0 else float("inf"),
+        "peak_mem_bytes": int(peak),
+        "final_error": float(result.best_score),
+    }
+    if profile:
+        clear_physics_cache()
+        profiler = Profiler()
+        _run(solver, JCASObjective(N, target_angles(M)), n_wolves, max_iter, seed, profiler)
+        record["profile"] = profiler.report()
+    return record
+
+
+def run_sweep(solvers, Ns, Ms, wolves, iters, repeats=3, seed=0, profile=False, log=print):
+    """Quét toàn bộ lưới cấu hình; TS-ILS không phụ thuộc số sói nên chỉ chạy một lần."""
+    records = []
+    seen = set()
+    for solver, N, M, n_wolves, max_iter in itertools.product(solvers, Ns, Ms, wolves, iters):
+        if M > N:
+            continue
+        if solver == "ts_ils":
+            n_wolves = 1
+        key = (solver, N, M, n_wolves, max_iter)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        record = benchmark_case(solver, N, M, n_wolves, max_iter, repeats, seed, profile)
+        records.append(record)
+        if log:
+            log(f"{solver:8s} N={N:5d} M={M:2d} wolves={n_wolves:4d} iter={max_iter:4d} | "
+                f"time={record['wall_time']*1e3:9.2f} ms | evals/s={record['evals_per_sec']:12.0f} | "
+                f"peak={record['peak_mem_bytes']/1024**2:8.2f} MiB | error={record['final_error']:.4f}")
+            if profile:
+                shares = ", ".join(f"{name} {entry['fraction']:.0%}"
+                                   for name, entry in record["profile"]["phases"].items())
+                log(f"{'':8s} phases: {shares}")
+    return records
+
+
+def environment_info():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save_results(records, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment_info(), "results": records}, f, indent=2)
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare_with_baseline(records, baseline, time_tolerance=0.2, error_tolerance=0.05):
+    """
+    So sánh với baseline theo từng cấu hình (solver, N, M, n_wolves, max_iter).
+    Hồi quy (regression) khi thời gian tăng quá time_tolerance (tỉ lệ)
+    hoặc sai số cuối tăng quá error_tolerance (tỉ lệ).
+    Trả về: danh sách dict so sánh, mỗi dict có cờ "regression".
+    """
+    base = {tuple(r[k] for k in CASE_KEYS): r for r in baseline}
+    report = []
+    for r in records:
+        key = tuple(r[k] for k in CASE_KEYS)
+        if key not in base:
+            continue
+        old = base[key]
+        time_ratio = r["wall_time"] / old["wall_time"] if old["wall_time"] > 0 else float("inf")
+        error_ratio = r["final_error"] / old["final_error"] if old["final_error"] > 0 else 1.0
+        report.append({
+            **dict(zip(CASE_KEYS, key)),
+            "time_ratio": time_ratio,
+            "error_ratio": error_ratio,
+            "regression": time_ratio > 1 + time_tolerance or error_ratio > 1 + error_tolerance,
+        })
+    return report
+
+
+def _int_list(text):
+    return [int(x) for x in text.split(",") if x]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark TS-ILS / GWO / GWO-PSO cho bài toán JCAS")
+    parser.add_argument("--solvers", default="ts_ils,gwo,gwo_pso")
+    parser.add_argument("--N", type=_int_list, default=[16, 64, 256, 1024], help="Số ăng-ten, ví dụ 16,64,256")
+    parser.add_argument("--M", type=_int_list, default=[1, 2, 4], help="Số hướng mục tiêu")
+    parser.add_argument("--wolves", type=_int_list, default=[30, 100], help="Kích thước bầy")
+    parser.add_argument("--iters", type=_int_list, default=[50, 100], help="Số vòng lặp")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="File JSON kết quả")
+    parser.add_argument("--baseline", help="File JSON kết quả cũ để so sánh hồi quy")
+    parser.add_argument("--time-tolerance", type=float, default=0.2)
+    parser.add_argument("--error-tolerance", type=float, default=0.05)
+    parser.add_argument("--profile", action="store_true", help="Đo thêm tỉ lệ thời gian từng pha")
+    args = parser.parse_args(argv)
+
+    records = run_sweep(args.solvers.split(","), args.N, args.M, args.wolves, args.iters,
+                        repeats=args.repeats, seed=args.seed, profile=args.profile)
+    save_results(records, args.output)
+    print(f"\n[DONE] Đã lưu {len(records)} kết quả vào: {args.output}")
+
+    if args.baseline:
+        report = compare_with_baseline(records, load_results(args.baseline),
+                                       args.time_tolerance, args.error_tolerance)
+        regressions = [r for r in report if r["regression"]]
+        print(f"\nSo sánh với baseline {args.baseline}: {len(report)} cấu hình khớp, "
+              f"{len(regressions)} hồi quy")
+        for r in report:
+            flag = "REGRESSION" if r["regression"] else "ok"
+            print(f"  {r['solver']:8s} N={r['N']:5d} M={r['M']:2d} wolves={r['n_wolves']:4d} "
+                  f"iter={r['max_iter']:4d} | time x{r['time_ratio']:.2f} | error x{r['error_ratio']:.3f} | {flag}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+Package dùng chung cho các thuật toán GWO / GWO-PSO / TS-ILS trong bài toán JCAS.
+
+Các script trong src/*/ tự thêm thư mục src/ vào sys.path rồi import từ đây,
+nên mọi cải tiến ở "hot path" chỉ cần sửa ở một chỗ.
+"""
@@ -0,0 +1,114 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .objectives import JCASObjective
+from .physics import steering_tensor
+from .rng import resolve_rng
+from .solvers import solve
+
+# ==========================================
+# GIẢI NHIỀU KỊCH BẢN CÙNG LÚC (BATCHED MULTI-SCENARIO)
+# ==========================================
+# S kịch bản (mỗi kịch bản là một bộ M góc mục tiêu) được giải song song
+# theo từng bước: mọi mảng có thêm trục kịch bản phía trước,
+# ví dụ Positions (S, n_wolves, N). Chi phí Python mỗi vòng lặp chỉ trả một
+# lần cho cả S kịch bản thay vì S lần.
+# Vòng lặp là chính các solver trong common/solvers.py (chúng nhận objective có
+# batch_shape), nên stop / callbacks / profiler / init / polish_sweeps / checkpoint
+# dùng được như khi gọi solve().
+
+@dataclass
+class BatchResult:
+    """Kết quả của solve_batch cho S kịch bản."""
+    solver: str
+    target_sets: np.ndarray       # Bộ góc mục tiêu (S x M)
+    best_positions: np.ndarray    # Pha tốt nhất của từng kịch bản (S x N), trong [0, 2pi)
+    best_scores: np.ndarray       # Fitness tốt nhất (S,)
+    convergence: np.ndarray       # Đường hội tụ (số vòng lặp x S), lượt dừng sớm kéo dài bằng giá trị cuối
+    n_evals: int = 0              # Tổng số lần đánh giá fitness (mọi kịch bản)
+    elapsed: float = 0.0
+
+
+class BatchJCASObjective:
+    """
+    Hàm mục tiêu JCAS cho S kịch bản: Positions (S x n x N) -> fitness (S x n).
+    A_targets (S x N x M) được dựng một lần cho mọi bộ góc (physics.steering_tensor).
+    batch_shape = (S,) báo cho solver biết đây là objective nhiều kịch bản.
+    """
+
+    def __init__(self, N, target_sets, gain=None):
+        self.N = N
+        self.target_sets = np.atleast_2d(np.asarray(target_sets, dtype=float))
+        self.A_targets = steering_tensor(N, self.target_sets)
+        self.gain = gain
+        self.d_mag = np.full(self.target_sets.shape, float(N if gain is None else gain))
+        self.batch_shape = (len(self.target_sets),)
+
+        self.dim = N
+        self.lb = 0
+        self.ub = 2 * np.pi
+
+    def __call__(self, Positions):
+        W = np.exp(1j * Positions)                               # (S, n, N)
+        Y = np.matmul(W, self.A_targets.conj())                  # (S, n, M)
+        return np.linalg.norm(np.abs(Y) - self.d_mag[:, np.newaxis, :], axis=-1)
+
+    def scenario(self, idx):
+        """Objective một kịch bản (JCASObjective) -- dùng cho init / polish_sweeps."""
+        return JCASObjective(self.N, self.target_sets[idx], self.gain)
+
+
+def _pad_curves(curves):
+    """
+    Ghép đường hội tụ (số vòng lặp x kịch bản) của các lượt theo trục kịch bản.
+    Mỗi lượt có thể dừng sớm ở vòng lặp khác nhau: lượt ngắn hơn được kéo dài bằng
+    giá trị cuối (như parallel._pad_curves).
+    """
+    length = max(len(curve) for curve in curves)
+    padded = np.empty((length, sum(curve.shape[1] for curve in curves)))
+    col = 0
+    for curve in curves:
+        width = curve.shape[1]
+        padded[:len(curve), col:col + width] = curve
+        padded[len(curve):, col:col + width] = curve[-1] if len(curve) else np.nan
+        col += width
+    return padded
+
+
+# Solver trong common/solvers.py nhận được objective nhiều kịch bản
+BATCH_SOLVERS = ("gwo", "gwo_pso", "ts_ils")
+
+
+def solve_batch(name, N, target_sets, chunk_size=None, rng=None, gain=None, **options):
+    """
+    Giải S kịch bản JCAS (mỗi hàng của target_sets là một bộ M góc, độ) cùng lúc.
+
+    name: "ts_ils", "gwo" hoặc "gwo_pso".
+    chunk_size: Số kịch bản mỗi lượt (giới hạn bộ nhớ S x n_wolves x N); None = tất cả.
+    rng: Generator / seed dùng chung cho cả lô (các kịch bản rút số nối tiếp nhau).
+    options: Tham số của solver, như solve() (n_wolves, max_iter, n_starts, stop, callbacks,
+             profiler, init, polish_sweeps, ...); stop / callbacks áp dụng cho từng lượt.
+    Với S = 1, GWO / GWO-PSO cho kết quả giống hệt solve() cùng seed.
+    """
+    if name not in BATCH_SOLVERS:
+        raise ValueError(f"Solver '{name}' không hỗ trợ chạy theo lô. "
+                         f"Có sẵn: {', '.join(sorted(BATCH_SOLVERS))}")
+    rng = resolve_rng(rng)
+    target_sets = np.atleast_2d(np.asarray(target_sets, dtype=float))
+    S = len(target_sets)
+    chunk_size = chunk_size or S
+
+    start = time.perf_counter()
+    positions, scores, curves, n_evals = [], [], [], 0
+    for first in range(0, S, chunk_size):
+        chunk = target_sets[first:first + chunk_size]
+        result = solve(name, BatchJCASObjective(N, chunk, gain), rng=rng, **options)
+        positions.append(result.best_position)
+        scores.append(result.best_score)
+        curves.append(np.reshape(result.convergence, (-1, len(chunk))))
+        n_evals += result.n_evals
+
+    return BatchResult(name, target_sets, np.concatenate(positions), np.concatenate(scores),
+                       _pad_curves(curves), n_evals, time.perf_counter() - start)
@@ -0,0 +1,149 @@
+import json
+import os
+import queue
+import threading
+
+import numpy as np
+
+# ==========================================
+# LƯU / KHÔI PHỤC TRẠNG THÁI SOLVER (CHECKPOINT)
+# ==========================================
+# Một checkpoint là một file .npz: các mảng trạng thái (Positions, Velocities,
+# đầu đàn, đường hội tụ, khối số ngẫu nhiên rút sẵn, ...) + mảng "meta" chứa
+# JSON (tên solver, cấu hình, vòng lặp, số evals, trạng thái bộ sinh số ngẫu nhiên).
+
+def _to_json(value):
+    """Trạng thái bit_generator có thể chứa mảng numpy (Philox) -> dạng JSON được."""
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, np.ndarray):
+        return {"__ndarray__": value.tolist(), "dtype": str(value.dtype)}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _from_json(value):
+    if isinstance(value, dict):
+        if "__ndarray__" in value:
+            return np.array(value["__ndarray__"], dtype=value["dtype"])
+        return {k: _from_json(v) for k, v in value.items()}
+    return value
+
+
+def rng_state(rng):
+    """Trạng thái đầy đủ của numpy.random.Generator (dạng JSON được)."""
+    return _to_json(rng.bit_generator.state)
+
+
+def restore_rng(state):
+    """Tạo lại Generator đúng loại bit_generator (PCG64, Philox, ...) với trạng thái đã lưu."""
+    state = _from_json(state)
+    bit_generator = getattr(np.random, state["bit_generator"])()
+    bit_generator.state = state
+    return np.random.Generator(bit_generator)
+
+
+def save_checkpoint(path, arrays, meta):
+    """Ghi nguyên tử: ghi ra file tạm rồi đổi tên, nên file cũ không bao giờ bị hỏng dở."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, meta=np.array(json.dumps(_to_json(meta))), **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """Trả về (arrays, meta)."""
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files if name != "meta"}
+        meta = _from_json(json.loads(str(data["meta"])))
+    return arrays, meta
+
+
+class AsyncCheckpointWriter:
+    """
+    Ghi checkpoint ở luồng nền để vòng lặp không phải chờ đĩa.
+    Hàng đợi giới hạn max_pending: nếu đĩa chậm hơn tốc độ tạo checkpoint thì
+    submit() chờ (không tích luỹ bộ nhớ vô hạn).
+    """
+
+    def __init__(self, max_pending=2):
+        self._queue = queue.Queue(max_pending)
+        self.error = None
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                save_checkpoint(*job)
+            except Exception as exc:                 # Báo lại ở luồng chính (flush / close)
+                self.error = exc
+            finally:
+                self._queue.task_done()
+
+    def submit(self, path, arrays, meta):
+        self._queue.put((path, arrays, meta))
+
+    def flush(self):
+        """Chờ ghi xong mọi checkpoint đang chờ."""
+        self._queue.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+
+class Checkpointer:
+    """
+    Lưu trạng thái solver mỗi `every` vòng lặp vào `path` (.npz, ghi đè).
+
+    async_write=True: sao chép mảng rồi ghi ở luồng nền (AsyncCheckpointWriter).
+    Luồng nền chỉ được tạo ở lần lưu đầu tiên và dừng khi close(); dùng với `with`
+    để luồng luôn được đóng:
+        with Checkpointer("run.npz", every=100) as ckpt:
+            solve("gwo", objective, checkpoint=ckpt)
+        solve("gwo", objective, resume_from="run.npz", ...)  # chạy tiếp y hệt
+    """
+
+    def __init__(self, path, every=100, async_write=True):
+        self.path = path
+        self.every = every
+        self.async_write = async_write
+        self._writer = None
+
+    def due(self, iteration):
+        return iteration % self.every == 0
+
+    def save(self, arrays, meta):
+        # Sao chép vì solver tiếp tục sửa các mảng tại chỗ
+        arrays = {name: np.array(value, copy=True) for name, value in arrays.items()}
+        if not self.async_write:
+            save_checkpoint(self.path, arrays, meta)
+            return
+        if self._writer is None:
+            self._writer = AsyncCheckpointWriter()
+        self._writer.submit(self.path, arrays, meta)
+
+    def flush(self):
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        """Ghi nốt checkpoint đang chờ và dừng luồng nền (lưu tiếp sau đó sẽ tạo luồng mới)."""
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# ==========================================
+# LƯU CODEBOOK TRỌNG SỐ BÚP SÓNG (MEMORY-MAPPED)
+# ==========================================
+# Một thư mục codebook cho một số ăng-ten N:
+#   phases.npy  : (capacity x N) float64, memmap - pha tối ưu của từng mục
+#   angles.npy  : (capacity x max_M) float64, memmap - bộ góc (đã sắp xếp, NaN ở chỗ trống)
+#   info.npy    : (capacity x 4) float64 - [M, bits (-1 = liên tục), số thứ tự solver, fitness]
+#   index.npy   : (count x 2) uint64 - [khoá, số hàng], SẮP XẾP theo khoá -> tra bằng searchsorted
+#   meta.json   : N, max_M, count, capacity, danh sách solver
+# Khoá = băm 64 bit của (N, solver, bits, bộ góc làm tròn 1e-3 độ).
+
+ANGLE_RESOLUTION = 1e-3        # Độ: hai bộ góc lệch nhỏ hơn mức này được coi là một
+ANY_BITS = "any"               # nearest(..., bits=ANY_BITS): không lọc theo số bit lượng tử
+
+
+def _normalize_angles(angles):
+    """Bộ góc là tập hợp: sắp xếp tăng dần và làm tròn theo ANGLE_RESOLUTION."""
+    angles = np.sort(np.ravel(np.asarray(angles, dtype=float)))
+    return np.round(angles / ANGLE_RESOLUTION) * ANGLE_RESOLUTION
+
+
+def codebook_key(N, angles, solver, bits=None):
+    """Khoá uint64 cho (N, bộ góc, solver, số bit lượng tử hoá)."""
+    ticks = np.round(_normalize_angles(angles) / ANGLE_RESOLUTION).astype(np.int64)
+    h = hashlib.blake2b(digest_size=8)
+    h.update(f"{N}|{solver}|{-1 if bits is None else bits}|".encode())
+    h.update(ticks.tobytes())
+    return np.uint64(int.from_bytes(h.digest(), "little"))
+
+
+class BeamCodebook:
+    """
+    Codebook pha tối ưu trên đĩa, đọc bằng memmap.
+
+        book = BeamCodebook("codebook_N64", N=64)
+        book.add_many(target_sets, phases, solver="gwo_pso", scores=scores)
+        book.lookup([0, -40], "gwo_pso")             # O(log n), None nếu chưa có
+        book.nearest([1, -38], "gwo_pso")            # bộ góc gần nhất đã lưu
+
+    Thêm lại một khoá đã có thì ghi đè hàng cũ.
+    """
+
+    def __init__(self, directory, N=None, max_M=8, capacity=1024):
+        if capacity < 1:
+            raise ValueError(f"capacity phải >= 1, nhận {capacity}")
+        self.directory = directory
+        meta_path = os.path.join(directory, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if N is not None and N != meta["N"]:
+                raise ValueError(f"Codebook {directory} dành cho N={meta['N']}, không phải N={N}")
+            self.N, self.max_M = meta["N"], meta["max_M"]
+            self.count, self.capacity = meta["count"], meta["capacity"]
+            self.solvers = meta["solvers"]
+            self._open("r+")
+            self._index = np.load(self._path("index.npy"))
+        else:
+            if N is None:
+                raise ValueError("Cần truyền N khi tạo codebook mới")
+            os.makedirs(directory, exist_ok=True)
+            self.N, self.max_M = N, max_M
+            self.count, self.capacity = 0, capacity
+            self.solvers = []
+            self._open("w+")
+            self._index = np.empty((0, 2), dtype=np.uint64)
+            self.flush()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _open(self, mode):
+        open_memmap = np.lib.format.open_memmap
+        shapes = {"phases.npy": (self.capacity, self.N), "angles.npy": (self.capacity, self.max_M),
+                  "info.npy": (self.capacity, 4)}
+        arrays = {}
+        for name, shape in shapes.items():
+            if mode == "w+":
+                arrays[name] = open_memmap(self._path(name), mode="w+", dtype=np.float64, shape=shape)
+            else:
+                arrays[name] = open_memmap(self._path(name), mode=mode)
+        self.phases, self.angles, self.info = arrays["phases.npy"], arrays["angles.npy"], arrays["info.npy"]
+
+    def _grow(self, needed):
+        """Tăng gấp đôi dung lượng (tạo file mới rồi chép) cho tới khi đủ `needed` hàng."""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self.capacity:
+            return
+        old = {"phases.npy": self.phases, "angles.npy": self.angles, "info.npy": self.info}
+        for name, array in old.items():
+            grown = np.lib.format.open_memmap(self._path(name + ".tmp"), mode="w+", dtype=np.float64,
+                                              shape=(capacity,) + array.shape[1:])
+            grown[:self.count] = array[:self.count]
+            grown.flush()
+            del grown
+        del old
+        self.phases = self.angles = self.info = None
+        for name in ("phases.npy", "angles.npy", "info.npy"):
+            os.replace(self._path(name + ".tmp"), self._path(name))
+        self.capacity = capacity
+        self._open("r+")
+
+    # --- GHI ---
+    def add_many(self, target_sets, phases, solver, bits=None, scores=None):
+        """Thêm (hoặc ghi đè) nhiều mục cùng lúc: target_sets (S x M), phases (S x N)."""
+        target_sets = np.atleast_2d(np.asarray(target_sets, dtype=float))
+        phases = np.atleast_2d(np.asarray(phases, dtype=float))
+        S, M = target_sets.shape
+        if M > self.max_M:
+            raise ValueError(f"Bộ góc có M={M} > max_M={self.max_M} của codebook")
+        if phases.shape != (S, self.N):
+            raise ValueError(f"phases phải có kích thước ({S}, {self.N}), nhận {phases.shape}")
+        scores = np.full(S, np.nan) if scores is None else np.asarray(scores, dtype=float)
+
+        keys = np.array([codebook_key(self.N, t, solver, bits) for t in target_sets], dtype=np.uint64)
+        # Trong cùng một lượt, khoá trùng -> giữ mục sau cùng
+        _, last = np.unique(keys[::-1], return_index=True)
+        keep = np.sort(S - 1 - last)
+        keys, target_sets, phases, scores = keys[keep], target_sets[keep], phases[keep], scores[keep]
+
+        # Khoá đã có -> ghi đè hàng cũ; khoá mới -> thêm hàng cuối
+        rows = self._find_rows(keys)
+        new = rows < 0
+        n_new = int(np.count_nonzero(new))
+        self._grow(self.count + n_new)
+        rows[new] = np.arange(self.count, self.count + n_new)
+        self.count += n_new
+
+        self.phases[rows] = phases
+        self.angles[rows] = np.nan
+        if solver not in self.solvers:
+            self.solvers.append(solver)
+        self.angles[rows, :M] = np.array([_normalize_angles(t) for t in target_sets])
+        self.info[rows, 0] = M
+        self.info[rows, 1] = -1 if bits is None else bits
+        self.info[rows, 2] = self.solvers.index(solver)
+        self.info[rows, 3] = scores
+
+        index = np.concatenate([self._index, np.column_stack([keys[new], rows[new].astype(np.uint64)])])
+        self._index = index[np.argsort(index[:, 0], kind="stable")]
+        self.flush()
+
+    def add(self, target_angles, phases, solver, bits=None, score=None):
+        self.add_many([target_angles], [phases], solver, bits, None if score is None else [score])
+
+    def add_batch(self, batch_result, bits=None):
+        """Thêm toàn bộ kết quả của batch.solve_batch."""
+        self.add_many(batch_result.target_sets, batch_result.best_positions, batch_result.solver,
+                      bits, batch_result.best_scores)
+
+    def flush(self):
+        for array in (self.phases, self.angles, self.info):
+            array.flush()
+        np.save(self._path("index.npy"), self._index)
+        with open(self._path("meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"N": self.N, "max_M": self.max_M, "count": self.count,
+                       "capacity": self.capacity, "solvers": self.solvers}, f, indent=2)
+
+    # --- ĐỌC ---
+    def _find_rows(self, keys):
+        """Số hàng của từng khoá (-1 nếu chưa có), tra bằng searchsorted trên chỉ mục đã sắp xếp."""
+        sorted_keys = self._index[:, 0]
+        pos = np.searchsorted(sorted_keys, keys)
+        pos = np.minimum(pos, max(len(sorted_keys) - 1, 0))
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        if len(sorted_keys):
+            found = sorted_keys[pos] == keys
+            rows[found] = self._index[pos[found], 1].astype(np.int64)
+        return rows
+
+    def lookup(self, target_angles, solver, bits=None):
+        """Pha đã lưu cho đúng (bộ góc, solver, bits); None nếu không có."""
+        row = self._find_rows(np.array([codebook_key(self.N, target_angles, solver, bits)], dtype=np.uint64))[0]
+        if row < 0:
+            return None
+        return np.array(self.phases[row])
+
+    def nearest(self, target_angles, solver=None, bits=None):
+        """
+        Mục gần nhất cho bộ góc chưa có trong codebook (cùng M; lọc theo solver nếu truyền vào).
+        bits: như lookup -- None chỉ nhận mục pha liên tục, số nguyên chỉ nhận đúng số bit đó;
+              ANY_BITS nhận mọi mục.
+        Khoảng cách = chuẩn Euclid giữa hai bộ góc đã sắp xếp (độ).
+        Trả về (phases, angles đã lưu, khoảng cách) hoặc None nếu không có mục phù hợp.
+        """
+        query = _normalize_angles(target_angles)
+        M = len(query)
+        info = self.info[:self.count]
+        mask = info[:, 0] == M
+        if bits != ANY_BITS:
+            mask &= info[:, 1] == (-1 if bits is None else bits)
+        if solver is not None:
+            if solver not in self.solvers:
+                return None
+            mask &= info[:, 2] == self.solvers.index(solver)
+        rows = np.flatnonzero(mask)
+        if len(rows) == 0:
+            return None
+        distances = np.linalg.norm(self.angles[rows, :M] - query, axis=-1)
+        best = int(np.argmin(distances))
+        row = rows[best]
+        return np.array(self.phases[row]), np.array(self.angles[row, :M]), float(distances[best])
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,73 @@
+import numpy as np
+
+# ==========================================
+# HÀM MỤC TIÊU THEO LÔ (BATCH FITNESS)
+# ==========================================
+def batch_fitness(Positions, A_targets, d_mag):
+    """
+    Tính fitness cho CẢ BẦY sói bằng một phép exp và một phép nhân ma trận.
+
+    Positions: Ma trận pha (n_wolves x N), mỗi hàng là một con sói.
+    A_targets: Ma trận lái tại các hướng mục tiêu (N x M).
+    d_mag: Biên độ mong muốn tại các hướng mục tiêu (M x 1 hoặc M,).
+    Trả về: Mảng (n_wolves,) chứa sai số L2 của từng con sói.
+    """
+    # Pha -> Trọng số phức cho cả bầy: W = e^(j*Phi)
+    W = np.exp(1j * Positions)
+
+    # Phản hồi tại các hướng Target: Y = (A^H * W^T)^T, kích thước (n_wolves x M)
+    Y = np.matmul(W, A_targets.conj())
+
+    # Sai số biên độ (L2 Norm) theo từng hàng
+    return np.linalg.norm(np.abs(Y) - np.reshape(d_mag, -1), axis=-1)
+
+# ==========================================
+# FITNESS BẰNG SỐ THỰC (KHÔNG NHÂN SỐ PHỨC)
+# ==========================================
+class RealFitnessKernel:
+    """
+    Cùng phép tính với batch_fitness nhưng chỉ dùng số thực.
+
+    Với W = cos(P) + j*sin(P) và conj(A) = Ar - j*Ai:
+        Re(Y) = cos(P) @ Ar + sin(P) @ Ai
+        Im(Y) = sin(P) @ Ar - cos(P) @ Ai
+    => [Re | Im] = cos(P) @ [Ar | -Ai] + sin(P) @ [Ai | Ar]  (hai phép GEMM thực).
+
+    Ar, Ai được tính sẵn một lần. dtype=np.float32 giảm một nửa lưu lượng bộ nhớ
+    cho bầy lớn (độ chính xác khoảng 1e-6 tương đối).
+    validate=True: mỗi lần gọi so sánh với batch_fitness (số phức), sai lệch vượt
+    dung sai -> RuntimeError. Chỉ dùng khi kiểm tra, vì phải tính cả hai đường.
+    """
+
+    def __init__(self, A_targets, d_mag, dtype=np.float64, validate=False):
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"dtype phải là float32 hoặc float64, nhận {self.dtype}")
+        self.A_targets = A_targets
+        self.d_mag = d_mag
+        self.validate = validate
+
+        Ar = np.real(A_targets)
+        Ai = np.imag(A_targets)
+        self.M = A_targets.shape[-1]
+        self.B_cos = np.ascontiguousarray(np.concatenate([Ar, -Ai], axis=-1), dtype=self.dtype)
+        self.B_sin = np.ascontiguousarray(np.concatenate([Ai, Ar], axis=-1), dtype=self.dtype)
+        self.d = np.reshape(d_mag, -1).astype(self.dtype)
+        # Dung sai khi kiểm tra, tính theo độ lớn của biên độ mong muốn
+        self.atol = (1e-3 if self.dtype == np.float32 else 1e-9) * max(float(np.max(np.abs(self.d))), 1.0)
+
+    def __call__(self, Positions):
+        P = np.asarray(Positions, dtype=self.dtype)
+        Y = np.matmul(np.cos(P), self.B_cos)               # (..., n, 2M) = [Re | Im]
+        Y += np.matmul(np.sin(P), self.B_sin)
+        # |Y| rồi trừ biên độ mong muốn, ghi đè vào nửa đầu của Y
+        mag = np.hypot(Y[..., :self.M], Y[..., self.M:], out=Y[..., :self.M])
+        mag -= self.d
+        errors = np.linalg.norm(mag, axis=-1)
+
+        if self.validate:
+            reference = batch_fitness(Positions, self.A_targets, self.d_mag)
+            if not np.allclose(errors, reference, rtol=0, atol=self.atol):
+                diff = float(np.max(np.abs(errors - reference)))
+                raise RuntimeError(f"RealFitnessKernel lệch so với đường số phức: {diff:.3e} > {self.atol:.1e}")
+        return errors
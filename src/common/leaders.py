@@ -0,0 +1,46 @@
+import numpy as np
+
+# ==========================================
+# CHỌN 3 CON ĐẦU ĐÀN (ALPHA / BETA / DELTA)
+# ==========================================
+def init_leaders(dim, batch_shape=()):
+    """
+    Khởi tạo 3 con đầu đàn: vị trí 0 và điểm số vô cùng lớn (inf) để dễ tìm min.
+    Trả về: leader_pos (3 x dim) và leader_scores (3,) theo thứ tự Alpha, Beta, Delta
+    (thêm các trục batch_shape phía trước nếu giải nhiều kịch bản cùng lúc).
+    """
+    leader_pos = np.zeros(tuple(batch_shape) + (3, dim))
+    leader_scores = np.full(tuple(batch_shape) + (3,), np.inf)
+    return leader_pos, leader_scores
+
+
+def select_leaders(fitness_values, Positions, leader_pos, leader_scores):
+    """
+    Chọn lại Alpha, Beta, Delta từ bầy sói mới GỘP với 3 con đầu đàn hiện tại.
+
+    fitness_values: Fitness của cả bầy (n_wolves,).
+    Positions: Ma trận vị trí (n_wolves x dim).
+    leader_pos, leader_scores: Đầu đàn hiện tại (3 x dim) và (3,).
+    Trả về: (leader_pos, leader_scores) mới, sắp xếp tăng dần theo điểm số.
+
+    Dùng argpartition nên chi phí O(n) mỗi vòng lặp, không cần sort cả bầy
+    và không có nhánh if/elif ở mức Python. Khác với chuỗi if/elif cũ,
+    khi có Alpha mới thì Alpha cũ được hạ xuống Beta, Beta cũ xuống Delta.
+    Các trục phía trước (nếu có) được coi là trục lô và xử lý độc lập.
+    """
+    # Ứng viên = [3 đầu đàn hiện tại, n con sói]
+    scores = np.concatenate([leader_scores, fitness_values], axis=-1)
+
+    # Lấy 3 ứng viên tốt nhất (chưa sắp xếp), rồi chỉ sắp xếp 3 phần tử đó
+    top = np.argpartition(scores, 2, axis=-1)[..., :3]
+    order = np.argsort(np.take_along_axis(scores, top, axis=-1), axis=-1, kind="stable")
+    top = np.take_along_axis(top, order, axis=-1)
+
+    new_scores = np.take_along_axis(scores, top, axis=-1)
+
+    # Lấy vị trí: chỉ số < 3 là đầu đàn cũ, còn lại là sói thứ (chỉ số - 3)
+    from_leaders = (top < 3)[..., np.newaxis]
+    old_pos = np.take_along_axis(leader_pos, np.minimum(top, 2)[..., np.newaxis], axis=-2)
+    new_pos = np.take_along_axis(Positions, np.maximum(top - 3, 0)[..., np.newaxis], axis=-2)
+
+    return np.where(from_leaders, old_pos, new_pos), new_scores
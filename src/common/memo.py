@@ -0,0 +1,113 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# ==========================================
+# GHI NHỚ KẾT QUẢ FITNESS (MEMOIZATION)
+# ==========================================
+def row_keys(X):
+    """Mỗi hàng của X (n x dim) -> một khoá dạng bytes (mảng np.void, dùng được với np.unique)."""
+    X = np.ascontiguousarray(X)
+    return X.view(np.dtype((np.void, X.dtype.itemsize * X.shape[-1])))[:, 0]
+
+
+class MemoTable:
+    """
+    Bảng LRU: khoá (hàng bytes) -> fitness, tối đa maxsize mục.
+
+    evaluate(keys, compute) trả về fitness cho từng khoá: các khoá trùng nhau
+    trong cùng lượt chỉ tính một lần, khoá đã có trong bảng không tính lại.
+    compute(rows) nhận chỉ số (trong keys) của các hàng cần tính thật.
+    """
+
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def evaluate(self, keys, compute):
+        unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        scores = np.empty(len(unique_keys))
+        missing = []
+        for i, key in enumerate(unique_keys):
+            key = key.tobytes()
+            if key in self._data:
+                self._data.move_to_end(key)
+                scores[i] = self._data[key]
+            else:
+                missing.append(i)
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            missing = np.array(missing)
+            scores[missing] = compute(first[missing])
+            for i in missing:
+                self._data[unique_keys[i].tobytes()] = scores[i]
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+        return scores[inverse.reshape(-1)]
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {
+            "entries": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class MemoizedObjective:
+    """
+    Bọc một objective (ma trận n x dim -> mảng n) bằng bảng nhớ LRU.
+
+    Ở các vòng lặp cuối nhiều con sói trùng với đầu đàn hoặc bị np.clip ghim
+    đúng vào lb/ub -> các hàng trùng hệt nhau không phải tính lại. Hữu ích khi
+    objective đắt (biểu đồ đầy đủ, búp phụ, ...).
+
+    quantum: None -> khoá là giá trị chính xác của hàng.
+             Số dương -> khoá là round(x / quantum): các nghiệm gần nhau (cùng ô)
+             dùng chung fitness của nghiệm đầu tiên rơi vào ô đó (xấp xỉ).
+    Các thuộc tính khác (dim, lb, ub, A_targets, ...) lấy từ objective gốc.
+    """
+
+    def __init__(self, objective, maxsize=65536, quantum=None):
+        self.objective = objective
+        self.quantum = quantum
+        self.memo = MemoTable(maxsize)
+
+    def __getattr__(self, name):
+        # Chỉ được gọi khi thuộc tính không có sẵn -> chuyển cho objective gốc
+        if name == "objective":
+            raise AttributeError(name)
+        return getattr(self.objective, name)
+
+    def __call__(self, Positions):
+        Positions = np.asarray(Positions, dtype=float)
+        flat = Positions.reshape(-1, Positions.shape[-1])
+        if self.quantum is None:
+            key_rows = flat + 0.0                      # -0.0 và 0.0 cùng một khoá
+        else:
+            key_rows = np.rint(flat / self.quantum).astype(np.int64)
+        scores = self.memo.evaluate(row_keys(key_rows), lambda rows: self.objective(flat[rows]))
+        return scores.reshape(Positions.shape[:-1])
+
+    def cache_info(self):
+        return self.memo.info()
+
+    def cache_clear(self):
+        self.memo.clear()
@@ -0,0 +1,133 @@
+import numpy as np
+
+from .fitness import RealFitnessKernel, batch_fitness
+from .physics import sidelobe_grid, steering_matrix, steering_pinv
+
+# ==========================================
+# HÀM MỤC TIÊU CHO CÁC SOLVER (BATCHED OBJECTIVES)
+# ==========================================
+# Quy ước: một "objective" là hàm nhận ma trận (n x dim) và trả về mảng (n,)
+# fitness (càng nhỏ càng tốt). Có thể gắn thêm dim / lb / ub để solver tự lấy.
+
+class JCASObjective:
+    """
+    Hàm mục tiêu JCAS: sai số biên độ tại các hướng mục tiêu, tính cho cả bầy.
+
+    Có sẵn A_targets và d_mag nên dùng được cho cả TS-ILS lẫn GWO / GWO-PSO.
+    Biến tối ưu là N góc pha trong [0, 2pi].
+
+    kernel: "complex" -> batch_fitness (exp + nhân ma trận phức),
+            "real"    -> RealFitnessKernel (cos/sin + 2 GEMM thực, xem fitness.py).
+    dtype, validate: Tham số của kernel "real" (float32/float64, so sánh với "complex").
+    """
+
+    def __init__(self, N, target_angles, gain=None, kernel="complex", dtype=np.float64,
+                 validate=False):
+        self.N = N
+        self.target_angles = list(target_angles)
+        self.A_targets = steering_matrix(N, self.target_angles)
+        # Biên độ mong muốn (mặc định Gain = N)
+        M = len(self.target_angles)
+        self.d_mag = np.ones((M, 1)) * (N if gain is None else gain)
+
+        if kernel == "real":
+            self._kernel = RealFitnessKernel(self.A_targets, self.d_mag, dtype, validate)
+        elif kernel == "complex":
+            self._kernel = None
+        else:
+            raise ValueError(f"kernel phải là 'complex' hoặc 'real', nhận '{kernel}'")
+        self.kernel = kernel
+
+        self.dim = N
+        self.lb = 0
+        self.ub = 2 * np.pi
+
+    @property
+    def A_pinv(self):
+        """pinv(A^H) cho TS-ILS (lưu đệm theo hình học mục tiêu trong physics)."""
+        return steering_pinv(self.N, self.target_angles)
+
+    def __call__(self, Positions):
+        if self._kernel is not None:
+            return self._kernel(Positions)
+        return batch_fitness(Positions, self.A_targets, self.d_mag)
+
+
+class SidelobeJCASObjective(JCASObjective):
+    """
+    Hàm mục tiêu JCAS có phạt búp phụ:
+        fitness = sai số biên độ tại mục tiêu + weight * mức búp phụ.
+
+    mode: "peak"       -> biên độ búp phụ lớn nhất (PSL),
+          "integrated" -> căn bậc hai năng lượng búp phụ trung bình (ISL, dạng RMS).
+    Cả hai cùng đơn vị biên độ với sai số mục tiêu (Gain = N ở búp chính).
+    Búp phụ được đo trên lưới thưa physics.sidelobe_grid (có lưu đệm), đã bỏ vùng
+    búp chính quanh mỗi mục tiêu; oversample, exclusion: tham số của lưới.
+    Mục tiêu và búp phụ được tính chung MỘT phép nhân ma trận cho cả bầy.
+    Thuộc tính A_targets / d_mag giữ nguyên: TS-ILS chỉ tối ưu phần mục tiêu, còn
+    best_score của nó được chấm lại bằng objective này (gồm cả búp phụ).
+    """
+
+    def __init__(self, N, target_angles, gain=None, mode="peak", weight=1.0, oversample=2,
+                 exclusion=None):
+        if mode not in ("peak", "integrated"):
+            raise ValueError(f"mode phải là 'peak' hoặc 'integrated', nhận '{mode}'")
+        super().__init__(N, target_angles, gain)
+        self.mode = mode
+        self.weight = weight
+        self.u_side, A_side = sidelobe_grid(N, self.target_angles, oversample, exclusion)
+        self.M = len(self.target_angles)
+        # [A_targets | A_side] liên hợp sẵn một lần
+        self._A_all = np.concatenate([self.A_targets, A_side], axis=1).conj()
+
+    def components(self, Positions):
+        """Trả về (sai số mục tiêu, mức búp phụ) cho cả bầy, mỗi thành phần (n,)."""
+        Y = np.abs(np.matmul(np.exp(1j * Positions), self._A_all))     # (n, M + L)
+        target_error = np.linalg.norm(Y[..., :self.M] - np.reshape(self.d_mag, -1), axis=-1)
+        side = Y[..., self.M:]
+        if self.mode == "peak":
+            level = np.max(side, axis=-1)
+        else:
+            level = np.sqrt(np.mean(side ** 2, axis=-1))
+        return target_error, level
+
+    def __call__(self, Positions):
+        target_error, level = self.components(Positions)
+        return target_error + self.weight * level
+
+
+def make_jcas_objective(N, target_angles, phase_bits=None, memo_size=0, memo_quantum=None,
+                        sidelobe_mode=None, sidelobe_weight=1.0):
+    """
+    Dựng objective JCAS theo cấu hình dùng chung của các script:
+    phase_bits: Số bit của bộ dịch pha (2-6) -> QuantizedJCASObjective; None -> pha liên tục.
+    memo_size: > 0 -> bọc MemoizedObjective (LRU tối đa memo_size con sói),
+               memo_quantum: bước làm tròn pha cho khoá nhớ (None = khớp chính xác).
+    sidelobe_mode: None, "peak" hoặc "integrated" -> SidelobeJCASObjective với
+                   trọng số sidelobe_weight (chưa hỗ trợ cùng phase_bits).
+    """
+    # Import trong hàm: quantize.py import ngược lại module này
+    from .memo import MemoizedObjective
+    from .quantize import QuantizedJCASObjective
+
+    if sidelobe_mode is not None:
+        if phase_bits is not None:
+            raise ValueError("sidelobe_mode chưa hỗ trợ cùng phase_bits")
+        objective = SidelobeJCASObjective(N, target_angles, mode=sidelobe_mode, weight=sidelobe_weight)
+    elif phase_bits is None:
+        objective = JCASObjective(N, target_angles)
+    else:
+        objective = QuantizedJCASObjective(N, target_angles, bits=phase_bits)
+    if memo_size:
+        objective = MemoizedObjective(objective, maxsize=memo_size, quantum=memo_quantum)
+    return objective
+
+
+def batched(fitness_function):
+    """
+    Bọc hàm fitness tính cho TỪNG con sói thành objective nhận cả ma trận.
+    Dùng cho các hàm cũ / placeholder chưa viết dạng vector hoá.
+    """
+    def objective(Positions):
+        return np.array([fitness_function(x) for x in Positions], dtype=float)
+    return objective
@@ -0,0 +1,99 @@
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+# ==========================================
+# THEO DÕI TIẾN TRÌNH (CALLBACK / OBSERVER)
+# ==========================================
+# Solver gọi từng observer sau mỗi vòng lặp: observer(state) với state là
+# IterationState. Observer là bất kỳ callable nào; mặc định không in gì.
+
+@dataclass
+class IterationState:
+    """Ảnh chụp gọn nhẹ sau một vòng lặp (best_position là tham chiếu, không sao chép)."""
+    solver: str
+    iteration: int                # Vòng lặp vừa xong, đếm từ 1
+    max_iter: int
+    best_score: float
+    n_evals: int
+    elapsed: float                # Giây kể từ lúc solver bắt đầu
+    best_position: np.ndarray = None
+
+
+def as_callbacks(callbacks):
+    """None / một observer / danh sách observer -> danh sách."""
+    if callbacks is None:
+        return []
+    if callable(callbacks):
+        return [callbacks]
+    return list(callbacks)
+
+
+def notify(callbacks, solver, iteration, max_iter, best_score, n_evals, start_time,
+           best_position=None):
+    """Tạo IterationState và gọi từng observer (không làm gì nếu danh sách rỗng)."""
+    if not callbacks:
+        return
+    state = IterationState(solver, iteration, max_iter, float(best_score), n_evals,
+                           time.perf_counter() - start_time, best_position)
+    for callback in callbacks:
+        callback(state)
+
+
+class SilentObserver:
+    """Không làm gì (tương đương callbacks=None)."""
+
+    def __call__(self, state):
+        pass
+
+
+class ConsoleReporter:
+    """
+    In tiến trình ra console, có giới hạn tần suất.
+    every: Chỉ in mỗi `every` vòng lặp; min_interval: Cách nhau ít nhất bấy nhiêu giây.
+    Vòng lặp cuối (iteration == max_iter) luôn được in.
+    """
+
+    def __init__(self, every=1, min_interval=0.0, stream=None):
+        self.every = every
+        self.min_interval = min_interval
+        self.stream = stream
+        self._last_print = None
+
+    def __call__(self, state):
+        last = state.iteration == state.max_iter
+        if not last:
+            if state.iteration % self.every:
+                return
+            now = time.perf_counter()
+            if self._last_print is not None and now - self._last_print < self.min_interval:
+                return
+        self._last_print = time.perf_counter()
+        print(f"Iter {state.iteration:03d}/{state.max_iter} | Best Fitness: {state.best_score:.6f}",
+              file=self.stream or sys.stdout)
+
+
+class ConvergenceRecorder:
+    """Ghi lại lịch sử (vòng lặp, fitness, số evals, thời gian) trong bộ nhớ."""
+
+    def __init__(self):
+        self.iterations = []
+        self.scores = []
+        self.n_evals = []
+        self.elapsed = []
+
+    def __call__(self, state):
+        self.iterations.append(state.iteration)
+        self.scores.append(state.best_score)
+        self.n_evals.append(state.n_evals)
+        self.elapsed.append(state.elapsed)
+
+    def as_arrays(self):
+        return {
+            "iteration": np.array(self.iterations),
+            "best_score": np.array(self.scores),
+            "n_evals": np.array(self.n_evals),
+            "elapsed": np.array(self.elapsed),
+        }
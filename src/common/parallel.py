@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .rng import make_rng
+from .solvers import solve
+
+# ==========================================
+# CHẠY NHIỀU LẦN ĐỘC LẬP SONG SONG (SO SÁNH THỐNG KÊ)
+# ==========================================
+# Biến môi trường quy định số luồng của các thư viện BLAS phổ biến
+_BLAS_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+# Giữ tham chiếu để giới hạn luồng của threadpoolctl còn hiệu lực trong worker
+_thread_limiter = None
+
+
+@dataclass
+class MultiRunResult:
+    """Tổng hợp K lần chạy độc lập của một solver."""
+    solver: str
+    results: list                  # OptimizeResult của từng lần chạy (theo thứ tự seed)
+    scores: np.ndarray             # Fitness cuối của từng lần chạy (K,)
+    curves: np.ndarray             # Đường hội tụ (K x L), lần chạy ngắn hơn được kéo dài bằng giá trị cuối
+    elapsed: float = 0.0           # Thời gian thực của cả lượt (giây)
+    stats: dict = field(default_factory=dict)
+
+    @property
+    def best(self):
+        return self.results[int(np.argmin(self.scores))]
+
+    @property
+    def worst(self):
+        return self.results[int(np.argmax(self.scores))]
+
+    @property
+    def median(self):
+        """Lần chạy có fitness ở vị trí trung vị (trung vị dưới nếu K chẵn)."""
+        order = np.argsort(self.scores, kind="stable")
+        return self.results[int(order[(len(order) - 1) // 2])]
+
+
+@contextmanager
+def _blas_thread_env(n_threads):
+    """Tạm đặt biến môi trường BLAS để các tiến trình con khởi động với n_threads luồng."""
+    saved = {var: os.environ.get(var) for var in _BLAS_ENV_VARS}
+    for var in _BLAS_ENV_VARS:
+        os.environ[var] = str(n_threads)
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def _init_worker(blas_threads):
+    """Khởi tạo worker: ghim số luồng BLAS để tránh quá tải CPU (oversubscription)."""
+    global _thread_limiter
+    for var in _BLAS_ENV_VARS:
+        os.environ[var] = str(blas_threads)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    _thread_limiter = threadpool_limits(limits=blas_threads)
+
+
+def _run_one(task):
+    name, objective, options, seed_seq, bit_generator = task
+    return solve(name, objective, rng=make_rng(seed_seq, bit_generator), **options)
+
+
+def _pad_curves(results):
+    length = max(len(r.convergence) for r in results)
+    curves = np.empty((len(results), length))
+    for k, r in enumerate(results):
+        curve = np.asarray(r.convergence, dtype=float)
+        curves[k, :curve.size] = curve
+        curves[k, curve.size:] = curve[-1] if curve.size else np.nan
+    return curves
+
+
+def run_many(name, objective, n_runs=100, seed=None, max_workers=None, blas_threads=1,
+             bit_generator="pcg64", **options):
+    """
+    Chạy K = n_runs lần độc lập của solver `name` trên ProcessPoolExecutor.
+
+    Mỗi lần chạy có Generator riêng sinh từ np.random.SeedSequence(seed).spawn(K),
+    nên kết quả lặp lại được và không phụ thuộc số worker.
+    bit_generator: "pcg64" hoặc "philox" (xem rng.make_rng).
+    objective phải pickle được (ví dụ JCASObjective; không dùng lambda / closure).
+    max_workers: Số tiến trình (mặc định os.cpu_count()); 1 -> chạy tuần tự ngay trong tiến trình này.
+    blas_threads: Số luồng BLAS cho mỗi worker.
+    options: Tham số chuyển tiếp cho solve() (n_wolves, max_iter, ...).
+    """
+    seed_seqs = np.random.SeedSequence(seed).spawn(n_runs)
+    tasks = [(name, objective, options, ss, bit_generator) for ss in seed_seqs]
+    max_workers = min(max_workers or os.cpu_count() or 1, n_runs)
+
+    start = time.perf_counter()
+    if max_workers <= 1:
+        results = [_run_one(task) for task in tasks]
+    else:
+        # "spawn": tiến trình con import numpy SAU khi biến môi trường BLAS đã được đặt
+        ctx = multiprocessing.get_context("spawn")
+        with _blas_thread_env(blas_threads):
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx,
+                                     initializer=_init_worker, initargs=(blas_threads,)) as executor:
+                chunksize = max(1, n_runs // (4 * max_workers))
+                results = list(executor.map(_run_one, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    scores = np.array([r.best_score for r in results], dtype=float)
+    stats = {
+        "n_runs": n_runs,
+        "best": float(scores.min()),
+        "median": float(np.median(scores)),
+        "worst": float(scores.max()),
+        "mean": float(scores.mean()),
+        "std": float(scores.std()),
+    }
+    return MultiRunResult(name, results, scores, _pad_curves(results), elapsed, stats)
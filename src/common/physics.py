@@ -0,0 +1,262 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# ==========================================
+# BỘ NHỚ ĐỆM LRU CHO CÁC MA TRẬN LÁI
+# ==========================================
+class ArrayLRUCache:
+    """
+    Bộ nhớ đệm LRU cho mảng numpy, giới hạn theo TỔNG SỐ BYTE.
+
+    Khi vượt quá max_bytes thì bỏ bớt các mục lâu không dùng nhất,
+    nên bộ nhớ luôn bị chặn trên dù quét nhiều N / độ phân giải khác nhau.
+    Mảng trả về là read-only để không ai vô tình sửa dữ liệu dùng chung.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get_or_compute(self, key, compute):
+        """Lấy mục theo key; nếu chưa có thì gọi compute() và lưu lại."""
+        if key in self._data:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key][0]
+
+        self.misses += 1
+        value = compute()
+        arrays = value if isinstance(value, tuple) else (value,)
+        for arr in arrays:
+            arr.setflags(write=False)
+        size = sum(arr.nbytes for arr in arrays)
+
+        # Mục lớn hơn cả giới hạn thì trả về luôn, không lưu
+        if size > self.max_bytes:
+            return value
+
+        self._data[key] = (value, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, old_size) = self._data.popitem(last=False)
+            self.current_bytes -= old_size
+        return value
+
+    def clear(self):
+        self._data.clear()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {
+            "entries": len(self._data),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_cache = ArrayLRUCache()
+
+
+def physics_cache_info():
+    """Thống kê bộ nhớ đệm vật lý (số mục, số byte, hit/miss)."""
+    return _cache.info()
+
+
+def clear_physics_cache():
+    """Xoá toàn bộ ma trận lái đã lưu."""
+    _cache.clear()
+
+
+def set_physics_cache_limit(max_bytes):
+    """Đổi giới hạn bộ nhớ (byte) của bộ nhớ đệm vật lý."""
+    _cache.max_bytes = max_bytes
+    _cache.clear()
+
+
+def _angles_key(angles):
+    return tuple(float(a) for a in np.ravel(angles))
+
+# ==========================================
+# CÁC HÀM VẬT LÝ (PHYSICS LAYER)
+# ==========================================
+def get_steering_vector(theta_deg, N):
+    """Tạo vector lái pha (N x 1) cho mảng tuyến tính đều, khoảng cách nửa bước sóng"""
+    theta_rad = np.radians(theta_deg)
+    k = np.arange(N).reshape(-1, 1)
+    sv = np.exp(1j * np.pi * k * np.sin(theta_rad))
+    return sv
+
+
+def steering_matrix(N, angles):
+    """
+    Ma trận lái (N x M) tại các góc angles (độ), có lưu đệm theo (N, angles).
+    """
+    key = ("steering", N, _angles_key(angles))
+
+    def compute():
+        k = np.arange(N).reshape(-1, 1)
+        theta_rads = np.radians(np.asarray(angles, dtype=float)).reshape(1, -1)
+        return np.exp(1j * np.pi * k * np.sin(theta_rads))
+
+    return _cache.get_or_compute(key, compute)
+
+
+def steering_tensor(N, angle_sets):
+    """
+    Ma trận lái cho nhiều bộ góc cùng lúc: angle_sets (S x M) -> (S x N x M),
+    có lưu đệm theo (N, angle_sets).
+    """
+    angle_sets = np.asarray(angle_sets, dtype=float)
+    key = ("steering_tensor", N, angle_sets.shape, _angles_key(angle_sets))
+
+    def compute():
+        k = np.arange(N).reshape(-1, 1)
+        theta_rads = np.radians(angle_sets)[..., np.newaxis, :]        # (S, 1, M)
+        return np.exp(1j * np.pi * k * np.sin(theta_rads))
+
+    return _cache.get_or_compute(key, compute)
+
+
+def steering_pinv(N, angles):
+    """
+    Giả nghịch đảo pinv(A^H) (N x M) của ma trận lái tại các góc angles,
+    có lưu đệm theo (N, angles): mỗi hình học mục tiêu chỉ phân tích SVD một lần.
+    """
+    key = ("pinv", N, _angles_key(angles))
+    return _cache.get_or_compute(key, lambda: np.linalg.pinv(steering_matrix(N, angles).conj().T))
+
+
+def sidelobe_grid(N, target_angles, oversample=2, exclusion=None):
+    """
+    Lưới thưa để đo búp phụ: u = sin(theta) đều trên [-1, 1] với bước 1 / (oversample * N)
+    (búp phụ rộng khoảng 2/N theo u, nên số điểm tỉ lệ với N chứ không cố định 1000),
+    bỏ các điểm trong vùng búp chính |u - u_target| < exclusion quanh mỗi mục tiêu
+    (mặc định 2/N: khoảng tới điểm null đầu tiên của mảng nửa bước sóng).
+    Trả về u (L,) và A_side (N x L), có lưu đệm theo (N, góc, oversample, exclusion).
+    """
+    exclusion = 2.0 / N if exclusion is None else float(exclusion)
+    key = ("sidelobe", N, _angles_key(target_angles), oversample, exclusion)
+
+    def compute():
+        u = np.linspace(-1, 1, 2 * oversample * N + 1)
+        u_targets = np.sin(np.radians(np.asarray(target_angles, dtype=float))).reshape(-1, 1)
+        u = u[np.all(np.abs(u - u_targets) >= exclusion, axis=0)]
+        k = np.arange(N).reshape(-1, 1)
+        return u, np.exp(1j * np.pi * k * u.reshape(1, -1))
+
+    return _cache.get_or_compute(key, compute)
+
+
+def scan_grid(N, resolution=1000):
+    """
+    Lưới quét đều từ -90 đến 90 độ và ma trận lái tương ứng A_scan (N x resolution),
+    có lưu đệm theo (N, resolution).
+    """
+    key = ("scan", N, resolution)
+
+    def compute():
+        angles = np.linspace(-90, 90, resolution)
+        k = np.arange(N).reshape(-1, 1)
+        theta_rads = np.radians(angles).reshape(1, -1)
+        return angles, np.exp(1j * np.pi * k * np.sin(theta_rads))
+
+    return _cache.get_or_compute(key, compute)
+
+
+# Hệ số đệm 0 mặc định của FFT (L >= FFT_OVERSAMPLE * N). Nội suy tuyến tính giữa các
+# điểm FFT: 16 * N sai tới ~0.85% đỉnh (-41 dB, lệch ~0.9 dB ở vùng -60 dB), 64 * N ~ -65 dB.
+FFT_OVERSAMPLE = 64
+
+
+def _default_n_fft(N, resolution=0):
+    return 1 << int(np.ceil(np.log2(max(FFT_OVERSAMPLE * N, resolution))))
+
+
+def array_factor_fft(w, n_fft=None):
+    """
+    Hệ số mảng y(u) = w^H a(u) trên lưới u = sin(theta) ĐỀU, tính bằng FFT có đệm 0.
+
+    Với mảng tuyến tính đều, y(u) = sum_k conj(w_k) * e^(j*pi*k*u) chính là DFT
+    của trọng số, nên cả lưới chỉ tốn O(L log L) thay vì O(N * L).
+    w: Trọng số phức (..., N), các trục phía trước là trục lô.
+    n_fft: Số điểm FFT L (mặc định: lũy thừa 2 >= FFT_OVERSAMPLE * N).
+    Trả về: u (L + 1,) từ -1 đến 1 và y (..., L + 1).
+    """
+    w = np.asarray(w)
+    N = w.shape[-1]
+    if n_fft is None:
+        n_fft = _default_n_fft(N)
+    if n_fft < N:
+        raise ValueError(f"n_fft={n_fft} phải >= số ăng-ten N={N}")
+
+    # Điểm m ứng với u = 2m / L; fftshift đưa u về [-1, 1)
+    response = n_fft * np.fft.ifft(w.conj(), n=n_fft, axis=-1)
+    response = np.fft.fftshift(response, axes=-1)
+
+    # u = 1 trùng với u = -1 (tuần hoàn chu kỳ 2) -> nối thêm để phủ kín [-1, 1]
+    response = np.concatenate([response, response[..., :1]], axis=-1)
+    u = np.arange(-n_fft // 2, n_fft // 2 + 1) * (2.0 / n_fft)
+    return u, response
+
+
+def calculate_pattern_fft(w, N, resolution=1000, n_fft=None, interpolate=True):
+    """
+    Biểu đồ bức xạ bằng FFT (dùng cho N lớn hoặc đánh giá trong vòng lặp tối ưu).
+
+    w: Trọng số phức (N,) hoặc theo lô (..., N).
+    n_fft: Số điểm FFT (mặc định: lũy thừa 2 >= max(FFT_OVERSAMPLE * N, resolution)).
+    interpolate=True: nội suy tuyến tính (số phức) về lưới góc đều -90..90 độ
+                      giống calculate_pattern_from_weights.
+    interpolate=False: trả về thẳng lưới u đều (góc = arcsin(u)), không nội suy.
+    """
+    w = np.asarray(w)
+    if n_fft is None:
+        n_fft = _default_n_fft(N, resolution)
+    u, response = array_factor_fft(w, n_fft)
+
+    if not interpolate:
+        return np.degrees(np.arcsin(u)), np.abs(response)
+
+    # Nội suy tuyến tính trên trục u cho cả lô cùng lúc
+    angles = np.linspace(-90, 90, resolution)
+    u_target = np.sin(np.radians(angles))
+    idx = np.clip(np.searchsorted(u, u_target), 1, u.size - 1)
+    t = (u_target - u[idx - 1]) / (u[idx] - u[idx - 1])
+    gains = np.abs((1 - t) * response[..., idx - 1] + t * response[..., idx])
+    return angles, gains
+
+
+def calculate_pattern_from_weights(w, N, resolution=1000, engine="matmul", n_fft=None):
+    """
+    Tính biểu đồ bức xạ từ trọng số phức w (N x 1 hoặc N,).
+    engine: "matmul" (nhân với A_scan đã lưu đệm) hoặc "fft" (calculate_pattern_fft).
+    n_fft: Số điểm FFT khi engine="fft" (None -> mặc định của calculate_pattern_fft).
+    """
+    if engine == "fft":
+        return calculate_pattern_fft(np.reshape(w, -1), N, resolution, n_fft)
+    if engine != "matmul":
+        raise ValueError(f"engine không hợp lệ: {engine!r} (chọn 'matmul' hoặc 'fft')")
+
+    angles, A_scan = scan_grid(N, resolution)
+    response = np.matmul(np.reshape(w, (1, -1)).conj(), A_scan)
+    gains = np.abs(response).flatten()
+    return angles, gains
+
+
+def calculate_full_pattern(phases, N, resolution=1000, engine="matmul", n_fft=None):
+    """
+    Tính biểu đồ bức xạ từ các góc pha (Input của GWO là pha)
+    phases: Mảng 1 chiều chứa N góc pha
+    engine, n_fft: xem calculate_pattern_from_weights
+    """
+    # Chuyển pha thành trọng số phức: w = e^(j*phi)
+    w = np.exp(1j * np.asarray(phases))
+    return calculate_pattern_from_weights(w, N, resolution, engine, n_fft)
@@ -0,0 +1,124 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from .results import load_run
+
+# ==========================================
+# VẼ HÌNH TÁCH RỜI KHỎI BƯỚC GIẢI (HEADLESS)
+# ==========================================
+# matplotlib chỉ được import khi thật sự vẽ. Hình được dựng bằng Figure +
+# FigureCanvasAgg (không dùng pyplot), nên không cần màn hình, không chặn,
+# và vẽ được ở luồng / tiến trình nền.
+
+# Kiểu vẽ mặc định; mỗi lần chạy có thể ghi đè qua meta["plot"]
+DEFAULT_STYLE = {
+    "pattern_title": "JCAS Beam Pattern (N={N})",
+    "pattern_color": "blue",
+    "pattern_label": None,
+    "conv_title": "Convergence Curve",
+    "conv_color": "darkgreen",
+    "conv_xlabel": "Iteration",
+    "conv_ylabel": "Error",
+    "conv_start": 0,           # Vòng lặp ứng với phần tử đầu của đường hội tụ
+    "markersize": 8,
+    "linewidth": 2,
+}
+
+
+def _draw(fig, run):
+    """Vẽ 2 hình (biểu đồ bức xạ + đường hội tụ) của một lần chạy lên fig."""
+    meta = run["meta"]
+    style = {**DEFAULT_STYLE, **meta.get("plot", {})}
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # HÌNH 1: Beam Pattern
+    gains = run["gains"]
+    gains_db = 20 * np.log10(gains / np.max(gains) + 1e-12)
+    ax1.plot(run["angles"], gains_db, linewidth=1.5, color=style["pattern_color"],
+             label=style["pattern_label"])
+    ax1.set_title(style["pattern_title"].format(**meta))
+    ax1.set_xlabel('Angle (degree)')
+    ax1.set_ylabel('Normalized Gain (dB)')
+    ax1.set_ylim([-60, 0])
+    ax1.grid(True, linestyle='--', alpha=0.6)
+    for t in meta.get("targets", []):
+        ax1.axvline(x=t, color='red', linestyle=':', linewidth=1.5, label=f'Target {t}')
+    ax1.legend()
+
+    # HÌNH 2: Convergence Curve
+    costs = run["convergence"]
+    start = style["conv_start"]
+    ax2.plot(range(start, start + len(costs)), costs, marker='.', markersize=style["markersize"],
+             color=style["conv_color"], linewidth=style["linewidth"])
+    ax2.set_title(style["conv_title"])
+    ax2.set_xlabel(style["conv_xlabel"])
+    ax2.set_ylabel(style["conv_ylabel"])
+    ax2.grid(True)
+    fig.tight_layout()
+
+
+def render_run(path, output=None, dpi=300):
+    """
+    Vẽ một lần chạy đã lưu (results.save_run) ra file ảnh bằng backend Agg.
+    output: Đường dẫn ảnh (mặc định <base>.png). Trả về đường dẫn ảnh.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    run = load_run(path)
+    fig = Figure(figsize=(16, 6))
+    FigureCanvasAgg(fig)
+    _draw(fig, run)
+    output = output or run["base"] + ".png"
+    fig.savefig(output, dpi=dpi)
+    return output
+
+
+def _render_job(job):
+    path, output, dpi = job
+    return render_run(path, output, dpi)
+
+
+def render_many(paths, outputs=None, dpi=300, max_workers=None):
+    """
+    Vẽ hàng loạt lần chạy song song (ProcessPoolExecutor, mỗi tiến trình một Agg).
+    Trả về danh sách đường dẫn ảnh theo thứ tự paths.
+    """
+    outputs = outputs or [None] * len(paths)
+    jobs = [(path, output, dpi) for path, output in zip(paths, outputs)]
+    if max_workers is not None and max_workers <= 1:
+        return [_render_job(job) for job in jobs]
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+        return list(pool.map(_render_job, jobs))
+
+
+class BackgroundRenderer:
+    """
+    Vẽ ở luồng nền để vòng lặp giải không phải chờ:
+        renderer = BackgroundRenderer()
+        future = renderer.submit(base)     # trả về concurrent.futures.Future
+        ...
+        renderer.close()                   # chờ vẽ xong
+    """
+
+    def __init__(self, max_workers=1, dpi=300):
+        self.dpi = dpi
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(self, path, output=None):
+        return self._pool.submit(render_run, path, output, self.dpi)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+
+def show_run(path):
+    """Mở cửa sổ xem một lần chạy (cần môi trường có màn hình); chặn tới khi đóng cửa sổ."""
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(16, 6))
+    _draw(fig, load_run(path))
+    plt.show()
@@ -0,0 +1,169 @@
+import cProfile
+import io
+import json
+import pstats
+import time
+import tracemalloc
+
+# ==========================================
+# ĐO THỜI GIAN THEO TỪNG PHA CỦA SOLVER
+# ==========================================
+# Solver bọc các pha nóng bằng `with profiler.phase("fitness"): ...` và đếm bằng
+# profiler.count(...). Mặc định solver dùng NULL_PROFILER: phase() trả về cùng
+# một context manager rỗng, count() không làm gì -> gần như không tốn chi phí.
+#
+# Các pha dùng trong solvers.py: "rng", "update", "fitness", "leaders", "polish".
+# Bộ đếm: "fitness_calls", "fitness_evals", "rng_draws".
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class NullProfiler:
+    """Profiler tắt: mọi lời gọi đều rỗng."""
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def count(self, name, n=1):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _Phase:
+    """Context manager đo một pha; mỗi tên pha dùng lại một đối tượng (không lồng cùng tên)."""
+    __slots__ = ("stats", "events", "track_memory", "name", "_start", "_mem")
+
+    def __init__(self, name, events, track_memory):
+        self.name = name
+        self.events = events
+        self.track_memory = track_memory
+        self.stats = {"calls": 0, "total_ns": 0, "peak_bytes": 0}
+
+    def __enter__(self):
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            self._mem = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        duration = end - self._start
+        self.stats["calls"] += 1
+        self.stats["total_ns"] += duration
+        if self.track_memory:
+            peak = tracemalloc.get_traced_memory()[1] - self._mem
+            self.stats["peak_bytes"] = max(self.stats["peak_bytes"], peak)
+        if self.events is not None:
+            self.events.append((self.name, self._start, duration))
+        return False
+
+
+class Profiler:
+    """
+    Bộ đo thời gian / bộ đếm cho solver: solve(..., profiler=Profiler()).
+
+    track_memory: Đo thêm số byte cấp phát đỉnh trong mỗi pha (tracemalloc, chậm hơn).
+    trace: Ghi lại từng lần vào pha để xuất Chrome trace (to_chrome_trace).
+    """
+    enabled = True
+
+    def __init__(self, track_memory=False, trace=False):
+        self.track_memory = track_memory
+        self.events = [] if trace else None
+        self.counters = {}
+        self._phases = {}
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def phase(self, name):
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(name, self.events, self.track_memory)
+        return phase
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def stop(self):
+        """Tắt tracemalloc (nếu profiler đã bật nó)."""
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # --- XUẤT KẾT QUẢ ---
+    def report(self):
+        """Báo cáo dạng dict: thời gian / số lần / tỉ lệ của từng pha và các bộ đếm."""
+        total_ns = sum(p.stats["total_ns"] for p in self._phases.values())
+        phases = {}
+        for name, phase in sorted(self._phases.items(), key=lambda item: -item[1].stats["total_ns"]):
+            stats = phase.stats
+            entry = {
+                "calls": stats["calls"],
+                "total_s": stats["total_ns"] / 1e9,
+                "mean_s": stats["total_ns"] / 1e9 / max(stats["calls"], 1),
+                "fraction": stats["total_ns"] / total_ns if total_ns else 0.0,
+            }
+            if self.track_memory:
+                entry["peak_bytes"] = stats["peak_bytes"]
+            phases[name] = entry
+        return {"total_s": total_ns / 1e9, "phases": phases, "counters": dict(self.counters)}
+
+    def format_report(self):
+        """Báo cáo dạng bảng chữ để in ra console."""
+        report = self.report()
+        lines = [f"{'phase':10s} {'calls':>8s} {'total ms':>10s} {'mean us':>10s} {'share':>7s}"]
+        for name, entry in report["phases"].items():
+            line = (f"{name:10s} {entry['calls']:8d} {entry['total_s']*1e3:10.2f} "
+                    f"{entry['mean_s']*1e6:10.1f} {entry['fraction']:7.1%}")
+            if "peak_bytes" in entry:
+                line += f"  peak={entry['peak_bytes']/1024:.1f} KiB"
+            lines.append(line)
+        for name, value in report["counters"].items():
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
+
+    def to_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def to_chrome_trace(self, path):
+        """
+        Xuất Trace Event Format (mở bằng chrome://tracing, Perfetto hoặc speedscope).
+        Cần Profiler(trace=True).
+        """
+        if self.events is None:
+            raise ValueError("Cần Profiler(trace=True) để xuất trace")
+        t0 = self.events[0][1] if self.events else 0
+        events = [{"name": name, "ph": "X", "pid": 0, "tid": 0,
+                   "ts": (start - t0) / 1e3, "dur": duration / 1e3}
+                  for name, start, duration in self.events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def run_cprofile(func, *args, output=None, sort="cumulative", limit=20, **kwargs):
+    """
+    Chạy func(*args, **kwargs) dưới cProfile.
+    output: Đường dẫn file .prof (định dạng pstats, mở được bằng snakeviz / pstats).
+    Trả về (kết quả của func, bảng thống kê dạng chữ).
+    """
+    profile = cProfile.Profile()
+    result = profile.runcall(func, *args, **kwargs)
+    if output is not None:
+        profile.dump_stats(output)
+    buffer = io.StringIO()
+    pstats.Stats(profile, stream=buffer).sort_stats(sort).print_stats(limit)
+    return result, buffer.getvalue()
@@ -0,0 +1,55 @@
+import numpy as np
+
+from .memo import MemoTable, row_keys
+from .objectives import JCASObjective
+
+# ==========================================
+# PHA LƯỢNG TỬ HOÁ (BỘ DỊCH PHA B BIT)
+# ==========================================
+class QuantizedJCASObjective(JCASObjective):
+    """
+    Hàm mục tiêu JCAS cho bộ dịch pha `bits` bit: chỉ có L = 2^bits mức pha
+    2*pi*l/L (l = 0..L-1).
+
+    Solver vẫn cập nhật vị trí liên tục, nhưng mỗi con sói được làm tròn về mức
+    gần nhất trước khi tính fitness -> điểm số chính là điểm số của cấu hình
+    triển khai được. solve() gọi snap() để trả về best_position đúng trên lưới mức.
+
+    Fitness dùng bảng tra exp(1j * mức) tính sẵn và gather theo chỉ số nguyên
+    (không gọi exp). Các con sói trùng mức trong cùng một lượt chỉ tính một lần,
+    và kết quả được nhớ lại (bảng LRU memo_size cấu hình, xem memo.py).
+    """
+
+    def __init__(self, N, target_angles, bits, gain=None, memo_size=65536):
+        if not 1 <= bits <= 8:
+            raise ValueError(f"bits phải trong khoảng 1..8, nhận {bits}")
+        super().__init__(N, target_angles, gain)
+        self.bits = bits
+        self.levels = 2 ** bits
+        self.step = 2 * np.pi / self.levels
+        self.lut = np.exp(1j * self.step * np.arange(self.levels))   # exp(1j * mức)
+        self.A_conj = np.conj(self.A_targets)
+        self.d = np.reshape(self.d_mag, -1)
+
+        self.memo = MemoTable(memo_size)
+
+    def indices(self, Positions):
+        """Chỉ số mức pha gần nhất (uint8) cho từng phần tử của Positions."""
+        idx = np.rint(np.asarray(Positions) / self.step).astype(np.intp) % self.levels
+        return idx.astype(np.uint8)
+
+    def snap(self, Positions):
+        """Làm tròn pha về mức gần nhất (giá trị trong [0, 2pi))."""
+        return self.indices(Positions) * self.step
+
+    def fitness_from_indices(self, idx):
+        """Fitness cho ma trận chỉ số mức (n x N): gather bảng tra rồi nhân ma trận."""
+        W = self.lut[idx]                                              # (n, N)
+        Y = W @ self.A_conj                                            # (n, M)
+        return np.linalg.norm(np.abs(Y) - self.d, axis=-1)
+
+    def __call__(self, Positions):
+        Positions = np.asarray(Positions)
+        idx = self.indices(Positions).reshape(-1, self.N)
+        scores = self.memo.evaluate(row_keys(idx), lambda rows: self.fitness_from_indices(idx[rows]))
+        return scores.reshape(Positions.shape[:-1])
@@ -0,0 +1,85 @@
+import numpy as np
+
+# ==========================================
+# FITNESS CẬP NHẬT TỪNG PHẦN (DELTA)
+# ==========================================
+class IncrementalFitness:
+    """
+    Giữ sẵn y = A^H w cho từng nghiệm để đổi pha MỘT ăng-ten chỉ tốn O(M).
+
+    Đổi pha ăng-ten k từ w_k sang w_k' làm y thay đổi một lượng hạng 1:
+        y' = y + conj(A[k, :]) * (w_k' - w_k)
+    nên không cần nhân lại cả ma trận (O(N*M)).
+
+    phases: Pha của các nghiệm (n x N) hoặc một nghiệm (N,).
+    """
+
+    def __init__(self, phases, A_targets, d_mag):
+        self.A_conj = np.conj(A_targets)                      # (N, M)
+        self.d = np.reshape(d_mag, -1)                        # (M,)
+        self.phases = np.mod(np.atleast_2d(np.asarray(phases, dtype=float)), 2 * np.pi)
+        self.resync()
+
+    def resync(self):
+        """Tính lại y chính xác (tránh sai số tích luỹ sau nhiều lần cập nhật delta)."""
+        self.w = np.exp(1j * self.phases)                     # (n, N)
+        self.y = self.w @ self.A_conj                         # (n, M)
+        self.errors = np.linalg.norm(np.abs(self.y) - self.d, axis=-1)
+
+    def delta_errors(self, k, new_phases):
+        """
+        Sai số khi thay pha ăng-ten k bằng new_phases (n x C ứng viên), không đổi trạng thái.
+        Trả về (n x C).
+        """
+        dw = np.exp(1j * new_phases) - self.w[:, k, np.newaxis]                   # (n, C)
+        y_new = self.y[:, np.newaxis, :] + dw[..., np.newaxis] * self.A_conj[k]   # (n, C, M)
+        return np.linalg.norm(np.abs(y_new) - self.d, axis=-1)
+
+    def apply(self, k, new_phase):
+        """Đổi pha ăng-ten k của mọi nghiệm thành new_phase (n,), cập nhật y trong O(M)."""
+        w_new = np.exp(1j * new_phase)
+        self.y += (w_new - self.w[:, k])[:, np.newaxis] * self.A_conj[k]
+        self.w[:, k] = w_new
+        self.phases[:, k] = np.mod(new_phase, 2 * np.pi)
+
+
+# ==========================================
+# TINH CHỈNH TỌA ĐỘ (COORDINATE-DESCENT POLISH)
+# ==========================================
+def coordinate_descent(phases, A_targets, d_mag, n_sweeps=2, n_candidates=16, shrink=0.5):
+    """
+    Tinh chỉnh nghiệm (ví dụ Alpha_pos của GWO / GWO-PSO) theo từng ăng-ten.
+
+    Mỗi lượt (sweep) duyệt k = 0..N-1: thử n_candidates pha quanh pha hiện tại
+    (lưới đều, bước 2pi/C ở lượt đầu, nhân shrink sau mỗi lượt), giữ pha tốt nhất
+    nếu giảm sai số. Nhờ IncrementalFitness, một lượt tốn cỡ n_candidates lần
+    đánh giá đầy đủ thay vì N * n_candidates. Sau mỗi lượt tính lại y chính xác.
+
+    phases: (N,) hoặc (n x N) nghiệm cần tinh chỉnh (tinh chỉnh song song).
+    Trả về:
+        phases: Nghiệm đã tinh chỉnh trong [0, 2pi), cùng kích thước đầu vào.
+        errors: Sai số tương ứng () hoặc (n,).
+        history: Sai số sau mỗi lượt (n_sweeps + 1, n), hàng 0 là trước khi tinh chỉnh.
+    """
+    single = np.ndim(phases) == 1
+    state = IncrementalFitness(phases, A_targets, d_mag)
+    N = state.phases.shape[1]
+    rows = np.arange(state.phases.shape[0])
+
+    # Lưới độ lệch có chứa 0 (giữ nguyên pha) -> sai số không bao giờ tăng
+    base_offsets = 2 * np.pi / n_candidates * (np.arange(n_candidates) - n_candidates // 2)
+    history = [state.errors.copy()]
+
+    for sweep in range(n_sweeps):
+        offsets = base_offsets * shrink ** sweep
+        for k in range(N):
+            candidates = state.phases[:, k, np.newaxis] + offsets            # (n, C)
+            errs = state.delta_errors(k, candidates)
+            best = np.argmin(errs, axis=-1)
+            state.apply(k, candidates[rows, best])
+        state.resync()
+        history.append(state.errors.copy())
+
+    if single:
+        return state.phases[0], state.errors[0], np.stack(history)
+    return state.phases, state.errors, np.stack(history)
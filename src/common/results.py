@@ -0,0 +1,46 @@
+import glob
+import json
+import os
+
+import numpy as np
+
+# ==========================================
+# LƯU KẾT QUẢ CHẠY (RESULTS STORE)
+# ==========================================
+# Mỗi lần chạy = hai file cùng tên gốc:
+#   <base>.npz  : mảng (pha tốt nhất, biểu đồ bức xạ, đường hội tụ, ...)
+#   <base>.json : thông tin mô tả (solver, N, góc mục tiêu, kiểu vẽ, ...)
+# Việc vẽ hình đọc lại từ đây (common/plotting.py), tách khỏi bước giải.
+
+def _base(path):
+    root, ext = os.path.splitext(path)
+    return root if ext in (".npz", ".json") else path
+
+
+def save_run(path, meta=None, **arrays):
+    """Lưu một lần chạy; trả về tên gốc (không đuôi) để truyền cho load_run / render_run."""
+    base = _base(path)
+    directory = os.path.dirname(base)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.savez(base + ".npz", **arrays)
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(meta or {}, f, indent=2, ensure_ascii=False)
+    return base
+
+
+def load_run(path):
+    """Đọc lại một lần chạy: dict các mảng + khoá "meta"."""
+    base = _base(path)
+    with np.load(base + ".npz") as data:
+        run = {name: data[name] for name in data.files}
+    with open(base + ".json", encoding="utf-8") as f:
+        run["meta"] = json.load(f)
+    run["base"] = base
+    return run
+
+
+def list_runs(directory):
+    """Tên gốc của mọi lần chạy trong thư mục (có đủ .npz và .json), đã sắp xếp."""
+    bases = [path[:-4] for path in glob.glob(os.path.join(directory, "*.npz"))]
+    return sorted(base for base in bases if os.path.exists(base + ".json"))
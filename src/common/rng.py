@@ -0,0 +1,86 @@
+import numpy as np
+
+# ==========================================
+# NGUỒN SỐ NGẪU NHIÊN (numpy.random.Generator)
+# ==========================================
+_BIT_GENERATORS = {
+    "pcg64": np.random.PCG64,
+    "philox": np.random.Philox,
+}
+
+
+def make_rng(seed=None, bit_generator="pcg64"):
+    """
+    Tạo numpy.random.Generator với bộ sinh bit được chọn.
+    seed: int, SeedSequence hoặc None (lấy entropy từ hệ điều hành).
+    bit_generator: "pcg64" (mặc định) hoặc "philox".
+    """
+    try:
+        bit_gen = _BIT_GENERATORS[bit_generator]
+    except KeyError:
+        raise ValueError(f"bit_generator không hợp lệ: {bit_generator!r} "
+                         f"(chọn một trong {sorted(_BIT_GENERATORS)})") from None
+    return np.random.Generator(bit_gen(seed))
+
+
+def resolve_rng(rng=None):
+    """
+    Chuẩn hoá tham số rng của các solver.
+
+    None: Generator mới (PCG64) với entropy từ hệ điều hành.
+    int / SeedSequence: Generator PCG64 tạo từ seed đó.
+    Generator: dùng nguyên như vậy.
+    Không còn dùng trạng thái toàn cục np.random (np.random.seed).
+    """
+    if isinstance(rng, np.random.Generator):
+        return rng
+    if rng is None or isinstance(rng, (int, np.integer, np.random.SeedSequence)):
+        return make_rng(rng)
+    raise TypeError(f"rng phải là None, seed (int / SeedSequence) hoặc numpy.random.Generator, "
+                    f"nhận được {type(rng).__name__}")
+
+
+class RandomStream:
+    """
+    Cấp số ngẫu nhiên U[0, 1) cho từng vòng lặp từ một khối rút sẵn.
+
+    shape: Kích thước số ngẫu nhiên cần cho MỘT vòng lặp.
+    block_iters: Số vòng lặp rút trước trong một lần gọi rng.random(out=...).
+    Thứ tự số ngẫu nhiên không phụ thuộc block_iters, nên kết quả giống hệt nhau
+    với mọi kích thước khối; khối lớn chỉ giảm số lần gọi vào bộ sinh.
+    """
+
+    def __init__(self, rng, shape, block_iters=1):
+        self.rng = rng
+        self.shape = tuple(shape)
+        self.block_iters = max(1, int(block_iters))
+        self._block = np.empty((self.block_iters,) + self.shape)
+        self._pos = self.block_iters
+        self.n_draws = 0                      # Tổng số số ngẫu nhiên đã rút
+
+    def next(self):
+        """Trả về khối số ngẫu nhiên (view, chỉ dùng trong vòng lặp hiện tại)."""
+        if self._pos >= self.block_iters:
+            self.rng.random(out=self._block)
+            self.n_draws += self._block.size
+            self._pos = 0
+        block = self._block[self._pos]
+        self._pos += 1
+        return block
+
+    def get_state(self):
+        """
+        Khối đã rút, vị trí đọc và số đã rút (để lưu checkpoint).
+        Khối đã dùng hết thì không cần lưu (trả về mảng rỗng).
+        """
+        block = self._block if self._pos < self.block_iters else np.empty(0)
+        return block, self._pos, self.n_draws
+
+    def set_state(self, block, pos, n_draws):
+        """Khôi phục từ get_state(); khối phải cùng kích thước (cùng block_iters)."""
+        self._pos = int(pos)
+        self.n_draws = int(n_draws)
+        if self._pos < self.block_iters:
+            if block.shape != self._block.shape:
+                raise ValueError(f"Khối số ngẫu nhiên {block.shape} không khớp {self._block.shape}")
+            self._block[...] = block
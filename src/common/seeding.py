@@ -0,0 +1,154 @@
+import numpy as np
+
+from .codebook import ANY_BITS
+from .ts_ils import ts_ils_batch
+
+# ==========================================
+# KHỞI TẠO BẦY SÓI (SEEDING / WARM START)
+# ==========================================
+# Thay vì rải ngẫu nhiên toàn bộ bầy trong [lb, ub], có thể bơm sẵn nghiệm tốt
+# (TS-ILS chạy vài vòng, lần chạy trước, codebook của kịch bản lân cận) cùng các
+# bản nhiễu quanh chúng, trộn với sói ngẫu nhiên để giữ đa dạng.
+# Chiến lược khởi tạo là đối tượng gọi được:
+#     strategy(objective, n_wolves, dim, lb, ub, rng) -> Positions (n_wolves x dim)
+# và có thuộc tính n_evals (số lần đánh giá fitness đã tốn để tạo hạt giống).
+
+class RandomInit:
+    """Rải đều ngẫu nhiên trong [lb, ub] (giống hệt cách khởi tạo mặc định)."""
+    n_evals = 0
+
+    def __call__(self, objective, n_wolves, dim, lb, ub, rng):
+        return rng.uniform(0, 1, (n_wolves, dim)) * (ub - lb) + lb
+
+
+class SeededInit:
+    """
+    Trộn nghiệm có sẵn vào bầy khởi tạo.
+
+    seeds: Các nghiệm hạt giống (k x dim) hoặc (dim,).
+    random_fraction: Tỉ lệ sói rải ngẫu nhiên (giữ đa dạng); phần còn lại là hạt giống.
+    sigma: Độ lệch chuẩn nhiễu Gauss của các bản sao, tính theo tỉ lệ (ub - lb).
+    periodic: True -> biến tuần hoàn (pha): cuộn về [lb, ub); False -> cắt biên.
+
+    Bố cục bầy: k hạt giống nguyên bản, rồi các bản nhiễu (lần lượt quanh từng
+    hạt giống), cuối cùng là sói ngẫu nhiên.
+    """
+    n_evals = 0
+
+    def __init__(self, seeds, random_fraction=0.5, sigma=0.05, periodic=True):
+        self.seeds = np.atleast_2d(np.asarray(seeds, dtype=float))
+        self.random_fraction = random_fraction
+        self.sigma = sigma
+        self.periodic = periodic
+
+    def __call__(self, objective, n_wolves, dim, lb, ub, rng):
+        seeds = self.seeds
+        if seeds.shape[1] != dim:
+            raise ValueError(f"Hạt giống có {seeds.shape[1]} chiều, bài toán có {dim} chiều")
+        n_random = int(round(self.random_fraction * n_wolves))
+        n_seeded = n_wolves - n_random
+        if len(seeds) == 0 or n_seeded == 0:
+            return RandomInit()(objective, n_wolves, dim, lb, ub, rng)
+
+        n_exact = min(len(seeds), n_seeded)
+        copies = seeds[np.arange(n_seeded - n_exact) % len(seeds)]
+        noise = rng.normal(0, self.sigma * (ub - lb), copies.shape)
+        seeded = np.concatenate([seeds[:n_exact], copies + noise])
+        if self.periodic:
+            seeded = lb + np.mod(seeded - lb, ub - lb)
+        else:
+            seeded = np.clip(seeded, lb, ub)
+        random = rng.uniform(0, 1, (n_random, dim)) * (ub - lb) + lb
+        return np.concatenate([seeded, random])
+
+
+def ts_ils_seeds(objective, n_seeds=4, max_iter=10, rng=None):
+    """
+    Chạy TS-ILS ngắn từ n_seeds điểm khởi tạo độc lập -> (pha n_seeds x N, số evals).
+    Mỗi điểm khởi tạo được coi như một "kịch bản" riêng của ts_ils_batch để giữ
+    lại nghiệm của từng lần chạy (không chỉ lần tốt nhất).
+    """
+    if not (hasattr(objective, "A_targets") and hasattr(objective, "d_mag")):
+        raise TypeError("Hạt giống TS-ILS cần objective có A_targets và d_mag (ví dụ JCASObjective)")
+    A_targets = np.asarray(objective.A_targets)
+    N, M = A_targets.shape
+    d_mag = np.ravel(objective.d_mag)
+    A_pinv = getattr(objective, "A_pinv", None)
+    if A_pinv is None:
+        A_pinv = np.linalg.pinv(A_targets.conj().T)
+    w, _, history = ts_ils_batch(np.broadcast_to(A_targets, (n_seeds, N, M)),
+                                 np.broadcast_to(d_mag, (n_seeds, M)), n_starts=1, max_iter=max_iter,
+                                 A_pinv=np.broadcast_to(A_pinv, (n_seeds, N, M)), rng=rng)
+    return np.mod(np.angle(w), 2 * np.pi), history.size
+
+
+class TSILSInit(SeededInit):
+    """Hạt giống lấy từ vài vòng TS-ILS trên chính objective (chạy lúc khởi tạo bầy)."""
+
+    def __init__(self, n_seeds=4, max_iter=10, random_fraction=0.5, sigma=0.05):
+        super().__init__(np.empty((0, 0)), random_fraction, sigma, periodic=True)
+        self.n_seeds = n_seeds
+        self.max_iter = max_iter
+        self.n_evals = 0
+
+    def __call__(self, objective, n_wolves, dim, lb, ub, rng):
+        self.seeds, self.n_evals = ts_ils_seeds(objective, self.n_seeds, self.max_iter, rng)
+        return super().__call__(objective, n_wolves, dim, lb, ub, rng)
+
+
+def codebook_seeds(codebook, target_angles, solver=None, bits=None, max_distance=None):
+    """
+    Hạt giống từ codebook (common/codebook.py): nghiệm đúng bộ góc nếu có,
+    nếu không thì nghiệm của bộ góc gần nhất (trong max_distance độ nếu truyền vào).
+    bits: None -> chỉ mục pha liên tục, số nguyên -> đúng số bit đó, codebook.ANY_BITS -> mọi mục.
+    Trả về mảng (k x N), k = 0 nếu không tìm được.
+    """
+    if solver is not None and bits != ANY_BITS:
+        phases = codebook.lookup(target_angles, solver, bits)
+        if phases is not None:
+            return phases[np.newaxis]
+    found = codebook.nearest(target_angles, solver, bits)
+    if found is None or (max_distance is not None and found[2] > max_distance):
+        return np.empty((0, codebook.N))
+    return found[0][np.newaxis]
+
+
+INIT_STRATEGIES = {
+    "random": RandomInit,
+    "ts_ils": TSILSInit,
+}
+
+
+def initial_positions(init, objective, n_wolves, dim, lb, ub, rng, batch_shape=()):
+    """
+    Tạo bầy khởi tạo theo `init`; trả về (Positions, số evals đã tốn).
+    init: None / "random" -> ngẫu nhiên đều; "ts_ils" -> TSILSInit();
+          mảng nghiệm (k x dim) -> SeededInit(mảng); hoặc một chiến lược gọi được.
+    batch_shape: Các trục kịch bản phía trước (giải nhiều kịch bản cùng lúc). Khi đó mỗi
+                 kịch bản được khởi tạo riêng với objective.scenario(idx); mảng hạt giống
+                 có thể dùng chung (k x dim) hoặc riêng từng kịch bản (batch_shape + (k, dim)).
+    """
+    batch_shape = tuple(batch_shape)
+    if init is None:
+        return rng.uniform(0, 1, batch_shape + (n_wolves, dim)) * (ub - lb) + lb, 0
+    if batch_shape:
+        seeds = None if isinstance(init, str) or callable(init) else np.asarray(init, dtype=float)
+        Positions = np.empty(batch_shape + (n_wolves, dim))
+        n_evals = 0
+        for idx in np.ndindex(*batch_shape):
+            scenario_init = seeds[idx] if seeds is not None and seeds.ndim > 2 else init
+            Positions[idx], evals = initial_positions(scenario_init, objective.scenario(idx),
+                                                      n_wolves, dim, lb, ub, rng)
+            n_evals += evals
+        return Positions, n_evals
+
+    if isinstance(init, str):
+        if init not in INIT_STRATEGIES:
+            raise ValueError(f"Không có chiến lược khởi tạo {init!r}. Có sẵn: {sorted(INIT_STRATEGIES)}")
+        init = INIT_STRATEGIES[init]()
+    elif not callable(init):
+        init = SeededInit(init)
+    Positions = np.array(init(objective, n_wolves, dim, lb, ub, rng), dtype=float)
+    if Positions.shape != (n_wolves, dim):
+        raise ValueError(f"Chiến lược khởi tạo trả về {Positions.shape}, cần {(n_wolves, dim)}")
+    return Positions, getattr(init, "n_evals", 0)
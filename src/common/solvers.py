@@ -0,0 +1,398 @@
+import json
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .checkpoint import load_checkpoint, restore_rng, rng_state
+from .leaders import init_leaders, select_leaders
+from .observers import as_callbacks, notify
+from .profiling import NULL_PROFILER
+from .refine import coordinate_descent
+from .rng import RandomStream, resolve_rng
+from .seeding import initial_positions
+from .stopping import StopMonitor
+from .swarm_update import (HybridWorkspace, gwo_update_positions,
+                           gwo_update_positions_scalar, hybrid_update)
+from .ts_ils import ts_ils_batch
+
+# ==========================================
+# KẾT QUẢ CHUNG CHO MỌI SOLVER
+# ==========================================
+@dataclass
+class OptimizeResult:
+    """Kết quả trả về chung của mọi solver trong registry."""
+    solver: str
+    best_position: np.ndarray     # Nghiệm tốt nhất (dim,)
+    best_score: float             # Fitness của nghiệm tốt nhất
+    convergence: list = field(default_factory=list)  # Fitness tốt nhất theo vòng lặp
+    n_evals: int = 0              # Số lần đánh giá fitness (tính theo từng con sói)
+    n_iter: int = 0               # Số vòng lặp đã chạy
+    elapsed: float = 0.0          # Thời gian chạy (giây)
+    stop_reason: str = "max_iter" # Lý do dừng: "max_iter" hoặc reason của điều kiện dừng
+
+# ==========================================
+# REGISTRY
+# ==========================================
+SOLVERS = {}
+
+
+def register_solver(name):
+    """Decorator đăng ký một solver vào registry dưới tên name."""
+    def decorator(fn):
+        SOLVERS[name] = fn
+        return fn
+    return decorator
+
+
+def available_solvers():
+    return sorted(SOLVERS)
+
+
+def get_solver(name):
+    try:
+        return SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"Không có solver {name!r}. Các solver hiện có: {available_solvers()}") from None
+
+
+def solve(name, objective, dim=None, lb=None, ub=None, **options):
+    """
+    Giao diện chung: chạy solver `name` trên objective (hàm batch n x dim -> n).
+
+    dim, lb, ub: Nếu bỏ trống thì lấy từ thuộc tính của objective (ví dụ JCASObjective).
+    options: Tham số riêng của solver (n_wolves, max_iter, rng, ...).
+             rng: numpy.random.Generator, seed (int / SeedSequence) hoặc None.
+             rng_block: Số vòng lặp rút số ngẫu nhiên trước trong một khối (GWO, GWO-PSO).
+             stop: Điều kiện dừng sớm (xem common/stopping.py), một hoặc danh sách.
+             callbacks: Observer (hoặc danh sách) gọi sau mỗi vòng lặp với IterationState
+                        (xem common/observers.py). Mặc định không in gì.
+             profiler: common.profiling.Profiler để đo thời gian từng pha (rng, update,
+                       fitness, leaders, polish) và đếm số lần gọi; None -> tắt.
+             checkpoint: common.checkpoint.Checkpointer lưu trạng thái định kỳ (GWO, GWO-PSO).
+             resume_from: Đường dẫn checkpoint để chạy tiếp (kết quả y hệt lần chạy liền mạch).
+             polish_sweeps: Số lượt tinh chỉnh tọa độ cho Alpha_pos sau khi chạy
+                            (GWO, GWO-PSO; xem common/refine.py), 0 = tắt.
+             init: Khởi tạo bầy (GWO, GWO-PSO; xem common/seeding.py): None = ngẫu nhiên,
+                   "ts_ils", mảng nghiệm hạt giống (k x dim) hoặc một chiến lược.
+    """
+    solver = get_solver(name)
+    dim = getattr(objective, "dim", None) if dim is None else dim
+    lb = getattr(objective, "lb", None) if lb is None else lb
+    ub = getattr(objective, "ub", None) if ub is None else ub
+    if dim is None or lb is None or ub is None:
+        raise ValueError("Cần truyền dim, lb, ub (objective không có sẵn các thuộc tính này)")
+
+    start = time.perf_counter()
+    result = solver(objective, dim, lb, ub, **options)
+
+    # Objective có lưới giá trị rời rạc (ví dụ pha lượng tử hoá): trả nghiệm trên lưới
+    snap = getattr(objective, "snap", None)
+    if snap is not None:
+        result.best_position = snap(result.best_position)
+        result.best_score = float(objective(result.best_position[np.newaxis])[0])
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _polish(objective, best_pos, best_score, polish_sweeps, profiler=NULL_PROFILER, n_candidates=16):
+    """
+    Tinh chỉnh tọa độ cho nghiệm tốt nhất (cần objective có A_targets, d_mag).
+    Điểm số được tính lại bằng chính objective; chỉ nhận nghiệm mới nếu tốt hơn.
+    Trả về (vị trí, điểm số, số evals): mỗi pha ứng viên thử cho một ăng-ten tính là
+    một lần đánh giá (polish_sweeps * N * n_candidates), cộng 1 lần chấm lại.
+    Nhiều kịch bản (best_score là mảng): tinh chỉnh từng kịch bản với objective.scenario(idx).
+    """
+    if not polish_sweeps:
+        return best_pos, best_score, 0
+    if np.ndim(best_score):
+        best_pos, best_score, n_evals = best_pos.copy(), best_score.copy(), 0
+        for idx in np.ndindex(*best_score.shape):
+            best_pos[idx], best_score[idx], evals = _polish(objective.scenario(idx), best_pos[idx],
+                                                            float(best_score[idx]), polish_sweeps,
+                                                            profiler, n_candidates)
+            n_evals += evals
+        return best_pos, best_score, n_evals
+    if not (hasattr(objective, "A_targets") and hasattr(objective, "d_mag")):
+        raise TypeError("polish_sweeps cần objective có A_targets và d_mag (ví dụ JCASObjective)")
+
+    with profiler.phase("polish"):
+        phases, _, _ = coordinate_descent(best_pos, objective.A_targets, objective.d_mag,
+                                          n_sweeps=polish_sweeps, n_candidates=n_candidates)
+        score = float(objective(phases[np.newaxis])[0])
+    n_evals = polish_sweeps * len(best_pos) * n_candidates + 1
+    if score < best_score:
+        return phases, score, n_evals
+    return best_pos, best_score, n_evals
+
+
+def _batch_shape(objective):
+    """Các trục kịch bản của objective (ví dụ batch.BatchJCASObjective); () nếu chỉ một bài toán."""
+    return tuple(getattr(objective, "batch_shape", ()))
+
+
+def _record(convergence_curve, summary_curve, leader_scores, batch_shape):
+    """
+    Ghi fitness tốt nhất của vòng lặp. Một bài toán: một số thực.
+    Nhiều kịch bản: mảng theo kịch bản vào convergence_curve, còn summary_curve
+    (dùng cho điều kiện dừng / observer) lấy kịch bản XẤU nhất.
+    """
+    best = leader_scores[..., 0]
+    if not batch_shape:
+        convergence_curve.append(float(best))
+        return float(best)
+    convergence_curve.append(best.copy())
+    summary_curve.append(float(np.max(best)))
+    return summary_curve[-1]
+
+
+def _summary(convergence_curve, batch_shape):
+    """Đường dùng cho StopMonitor: chính convergence_curve, hoặc kịch bản xấu nhất theo vòng lặp."""
+    if not batch_shape:
+        return convergence_curve
+    return [float(np.max(c)) for c in convergence_curve]
+
+
+def _resume(path, solver, config):
+    """Đọc checkpoint và kiểm tra khớp solver / cấu hình (max_iter, số sói, ...)."""
+    arrays, meta = load_checkpoint(path)
+    config = json.loads(json.dumps(config))
+    if meta["solver"] != solver or meta["config"] != config:
+        raise ValueError(f"Checkpoint {path} ({meta['solver']}, {meta['config']}) "
+                         f"không khớp lần chạy này ({solver}, {config})")
+    return arrays, meta
+
+
+def _save_checkpoint(checkpoint, solver, config, iteration, rng, stream, n_evals,
+                     convergence_curve, **arrays):
+    block, pos, n_draws = stream.get_state()
+    arrays.update(convergence=np.array(convergence_curve), rng_block=block)
+    checkpoint.save(arrays, {
+        "solver": solver,
+        "config": config,
+        "iteration": iteration,
+        "n_evals": n_evals,
+        "rng_state": rng_state(rng),
+        "rng_pos": pos,
+        "rng_draws": n_draws,
+    })
+
+# ==========================================
+# GWO
+# ==========================================
+# GWO, GWO-PSO và TS-ILS nhận được objective nhiều kịch bản (thuộc tính batch_shape,
+# ví dụ batch.BatchJCASObjective): mọi mảng có thêm các trục kịch bản phía trước,
+# best_position / best_score / mỗi phần tử convergence cũng vậy. n_evals là tổng
+# mọi kịch bản; điều kiện dừng và observer nhìn kịch bản xấu nhất.
+@register_solver("gwo")
+def run_gwo(objective, dim, lb, ub, n_wolves=50, max_iter=100, vectorized=True, rng=None,
+            rng_block=1, stop=None, polish_sweeps=0, callbacks=None, profiler=None,
+            checkpoint=None, resume_from=None, init=None):
+    """
+    Grey Wolf Optimizer. Mỗi vòng lặp: kiểm tra biên -> đánh giá cả bầy ->
+    chọn Alpha/Beta/Delta -> cập nhật vị trí.
+    vectorized=False dùng vòng lặp vô hướng cũ (chỉ để so sánh).
+    """
+    batch = _batch_shape(objective)
+    if batch and not vectorized:
+        raise ValueError("vectorized=False không hỗ trợ objective nhiều kịch bản")
+    config = {"n_wolves": n_wolves, "dim": dim, "lb": float(lb), "ub": float(ub),
+              "max_iter": max_iter, "vectorized": vectorized, "rng_block": rng_block}
+    if batch:
+        config["batch_shape"] = list(batch)
+    random_shape = batch + (n_wolves, dim, 3, 2)
+    if resume_from is None:
+        rng = resolve_rng(rng)
+        Positions, n_evals = initial_positions(init, objective, n_wolves, dim, lb, ub, rng, batch)
+        leader_pos, leader_scores = init_leaders(dim, batch)
+        stream = RandomStream(rng, random_shape, rng_block)
+        convergence_curve = []
+        start_iter = 0
+    else:
+        arrays, meta = _resume(resume_from, "gwo", config)
+        rng = restore_rng(meta["rng_state"])
+        Positions, leader_pos, leader_scores = arrays["positions"], arrays["leader_pos"], arrays["leader_scores"]
+        stream = RandomStream(rng, random_shape, rng_block)
+        stream.set_state(arrays["rng_block"], meta["rng_pos"], meta["rng_draws"])
+        convergence_curve = list(arrays["convergence"]) if batch else arrays["convergence"].tolist()
+        n_evals = meta["n_evals"]
+        start_iter = meta["iteration"]
+    summary_curve = _summary(convergence_curve, batch)
+    monitor = StopMonitor(stop)
+    callbacks = as_callbacks(callbacks)
+    prof = profiler or NULL_PROFILER
+
+    for l in range(start_iter, max_iter):
+        with prof.phase("update"):
+            np.clip(Positions, lb, ub, out=Positions)
+        with prof.phase("fitness"):
+            fitness_values = objective(Positions)
+        n_evals += fitness_values.size
+        prof.count("fitness_calls")
+        with prof.phase("leaders"):
+            leader_pos, leader_scores = select_leaders(fitness_values, Positions, leader_pos, leader_scores)
+
+        # a giảm tuyến tính từ 2 về 0
+        a = 2 - l * ((2) / max_iter)
+        alpha, beta, delta = leader_pos[..., 0, :], leader_pos[..., 1, :], leader_pos[..., 2, :]
+        if vectorized:
+            with prof.phase("rng"):
+                r = stream.next()
+            with prof.phase("update"):
+                gwo_update_positions(Positions, alpha, beta, delta, a, r=r)
+        else:
+            with prof.phase("update"):
+                gwo_update_positions_scalar(Positions, alpha, beta, delta, a, rng)
+
+        best = _record(convergence_curve, summary_curve, leader_scores, batch)
+        notify(callbacks, "gwo", l + 1, max_iter, best, n_evals, monitor.start_time, alpha)
+        if checkpoint is not None and checkpoint.due(l + 1):
+            _save_checkpoint(checkpoint, "gwo", config, l + 1, rng, stream, n_evals, convergence_curve,
+                             positions=Positions, leader_pos=leader_pos, leader_scores=leader_scores)
+
+        if monitor.check(summary_curve, n_evals):
+            break
+
+    if checkpoint is not None:
+        checkpoint.flush()
+    best_pos, best_score, polish_evals = _polish(objective, leader_pos[..., 0, :],
+                                                 leader_scores[..., 0] if batch else float(leader_scores[0]),
+                                                 polish_sweeps, prof)
+    n_evals += polish_evals
+    prof.count("fitness_evals", n_evals)
+    prof.count("rng_draws", stream.n_draws if vectorized else len(convergence_curve) * n_wolves * dim * 6)
+    return OptimizeResult("gwo", best_pos, best_score, convergence_curve,
+                          n_evals, len(convergence_curve), stop_reason=monitor.stop_reason)
+
+# ==========================================
+# HYBRID GWO-PSO
+# ==========================================
+@register_solver("gwo_pso")
+def run_gwo_pso(objective, dim, lb, ub, n_wolves=30, max_iter=50,
+                w_pso=0.5, c1=1.5, c2=1.5, rng=None, rng_block=1, stop=None, polish_sweeps=0,
+                callbacks=None, profiler=None, checkpoint=None, resume_from=None, init=None):
+    """
+    Hybrid GWO-PSO: vị trí mới = 50% GWO + 50% PSO (vận tốc dẫn bởi Alpha, Beta).
+    w_pso: Trọng số quán tính; c1, c2: Hệ số hướng về Alpha, Beta.
+    """
+    batch = _batch_shape(objective)
+    config = {"n_wolves": n_wolves, "dim": dim, "lb": float(lb), "ub": float(ub),
+              "max_iter": max_iter, "w_pso": w_pso, "c1": c1, "c2": c2, "rng_block": rng_block}
+    if batch:
+        config["batch_shape"] = list(batch)
+    workspace = HybridWorkspace(batch + (n_wolves, dim))
+    monitor = StopMonitor(stop)
+    callbacks = as_callbacks(callbacks)
+    prof = profiler or NULL_PROFILER
+
+    if resume_from is None:
+        rng = resolve_rng(rng)
+        Positions, n_evals = initial_positions(init, objective, n_wolves, dim, lb, ub, rng, batch)
+        Velocities = np.zeros(Positions.shape)
+        stream = RandomStream(rng, workspace.random_shape, rng_block)
+        leader_pos, leader_scores = init_leaders(dim, batch)
+
+        # Đánh giá ban đầu
+        with prof.phase("fitness"):
+            fitness_values = objective(Positions)
+        n_evals += fitness_values.size
+        prof.count("fitness_calls")
+        with prof.phase("leaders"):
+            leader_pos, leader_scores = select_leaders(fitness_values, Positions, leader_pos, leader_scores)
+
+        convergence_curve = []
+        start_iter = 0
+    else:
+        arrays, meta = _resume(resume_from, "gwo_pso", config)
+        rng = restore_rng(meta["rng_state"])
+        Positions, Velocities = arrays["positions"], arrays["velocities"]
+        leader_pos, leader_scores = arrays["leader_pos"], arrays["leader_scores"]
+        stream = RandomStream(rng, workspace.random_shape, rng_block)
+        stream.set_state(arrays["rng_block"], meta["rng_pos"], meta["rng_draws"])
+        convergence_curve = list(arrays["convergence"]) if batch else arrays["convergence"].tolist()
+        n_evals = meta["n_evals"]
+        start_iter = meta["iteration"]
+    summary_curve = _summary(convergence_curve, batch)
+
+    for l in range(start_iter, max_iter):
+        a = 2 - l * ((2) / max_iter)
+        with prof.phase("rng"):
+            R = stream.next()
+        with prof.phase("update"):
+            hybrid_update(Positions, Velocities, leader_pos, a, w_pso, c1, c2, lb, ub, workspace, R=R)
+
+        with prof.phase("fitness"):
+            fitness_values = objective(Positions)
+        n_evals += fitness_values.size
+        prof.count("fitness_calls")
+        with prof.phase("leaders"):
+            leader_pos, leader_scores = select_leaders(fitness_values, Positions, leader_pos, leader_scores)
+
+        best = _record(convergence_curve, summary_curve, leader_scores, batch)
+        notify(callbacks, "gwo_pso", l + 1, max_iter, best, n_evals,
+               monitor.start_time, leader_pos[..., 0, :])
+        if checkpoint is not None and checkpoint.due(l + 1):
+            _save_checkpoint(checkpoint, "gwo_pso", config, l + 1, rng, stream, n_evals,
+                             convergence_curve, positions=Positions, velocities=Velocities,
+                             leader_pos=leader_pos, leader_scores=leader_scores)
+
+        if monitor.check(summary_curve, n_evals):
+            break
+
+    if checkpoint is not None:
+        checkpoint.flush()
+    best_pos, best_score, polish_evals = _polish(objective, leader_pos[..., 0, :],
+                                                 leader_scores[..., 0] if batch else float(leader_scores[0]),
+                                                 polish_sweeps, prof)
+    n_evals += polish_evals
+    prof.count("fitness_evals", n_evals)
+    prof.count("rng_draws", stream.n_draws)
+    return OptimizeResult("gwo_pso", best_pos, best_score, convergence_curve,
+                          n_evals, len(convergence_curve), stop_reason=monitor.stop_reason)
+
+# ==========================================
+# TS-ILS
+# ==========================================
+@register_solver("ts_ils")
+def run_ts_ils(objective, dim, lb, ub, n_starts=1, max_iter=50, rng=None, stop=None,
+               callbacks=None, profiler=None):
+    """
+    TS-ILS (giải tích). Chỉ dùng được với objective có A_targets và d_mag
+    (ví dụ JCASObjective). best_position là vector pha trong [0, 2pi).
+    convergence có max_iter + 1 phần tử (phần tử 0 là sai số lúc khởi tạo) và là sai số
+    mục tiêu TS-ILS tự tối ưu; best_score được chấm lại bằng chính objective (giống GWO /
+    GWO-PSO), nên với objective có thêm thành phần (ví dụ phạt búp phụ) hai số này khác nhau.
+    """
+    if not (hasattr(objective, "A_targets") and hasattr(objective, "d_mag")):
+        raise TypeError("Solver 'ts_ils' cần objective có A_targets và d_mag (ví dụ JCASObjective)")
+
+    monitor = StopMonitor(stop)
+    callbacks = as_callbacks(callbacks)
+    prof = profiler or NULL_PROFILER
+
+    def on_iteration(curve, n_evals):
+        notify(callbacks, "ts_ils", len(curve) - 1, max_iter, curve[-1], n_evals, monitor.start_time)
+        return monitor.check(curve, n_evals)
+
+    w_best, best_error, history = ts_ils_batch(objective.A_targets, objective.d_mag,
+                                               n_starts=n_starts, max_iter=max_iter,
+                                               A_pinv=getattr(objective, "A_pinv", None),
+                                               rng=resolve_rng(rng), callback=on_iteration,
+                                               profiler=prof)
+    n_iter = len(history) - 1
+    # Đường hội tụ của lần khởi tạo tốt nhất (của từng kịch bản nếu có nhiều kịch bản)
+    best = np.argmin(history[-1], axis=-1)
+    curves = np.take_along_axis(history, best[np.newaxis, ..., np.newaxis], axis=-1)[..., 0]
+    convergence_curve = list(curves) if np.ndim(best_error) else [float(e) for e in curves]
+
+    phases = np.mod(np.angle(w_best), 2 * np.pi)
+    # Chấm lại bằng objective: best_score so sánh được giữa các solver
+    with prof.phase("fitness"):
+        best_score = objective(phases[..., np.newaxis, :])[..., 0]
+    if not np.ndim(best_score):
+        best_score = float(best_score)
+    n_scenarios = int(np.size(best_error))
+    return OptimizeResult("ts_ils", phases, best_score, convergence_curve,
+                          n_starts * (n_iter + 1) * n_scenarios + n_scenarios, n_iter,
+                          stop_reason=monitor.stop_reason)
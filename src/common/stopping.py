@@ -0,0 +1,90 @@
+import time
+
+# ==========================================
+# ĐIỀU KIỆN DỪNG SỚM (EARLY STOPPING)
+# ==========================================
+# Mỗi điều kiện có check(curve, n_evals, elapsed) trả về lý do dừng (str) hoặc None.
+# curve: Fitness tốt nhất theo vòng lặp (không tăng), n_evals: số lần đánh giá,
+# elapsed: số giây từ lúc solver bắt đầu. Các điều kiện được kiểm tra sau mỗi vòng lặp.
+
+class RelativeTolerance:
+    """Dừng khi fitness tốt nhất cải thiện ít hơn rtol (tương đối) trong `window` vòng lặp gần nhất."""
+    reason = "rel_tol"
+
+    def __init__(self, rtol=1e-6, window=10):
+        self.rtol = rtol
+        self.window = window
+
+    def check(self, curve, n_evals, elapsed):
+        if len(curve) <= self.window:
+            return None
+        old, new = curve[-self.window - 1], curve[-1]
+        if old - new <= self.rtol * abs(old):
+            return self.reason
+        return None
+
+
+class TargetError:
+    """Dừng khi fitness tốt nhất <= value."""
+    reason = "target_error"
+
+    def __init__(self, value):
+        self.value = value
+
+    def check(self, curve, n_evals, elapsed):
+        if curve and curve[-1] <= self.value:
+            return self.reason
+        return None
+
+
+class TimeBudget:
+    """Dừng khi thời gian chạy vượt quá `seconds` giây."""
+    reason = "time_budget"
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def check(self, curve, n_evals, elapsed):
+        if elapsed >= self.seconds:
+            return self.reason
+        return None
+
+
+class MaxEvaluations:
+    """Dừng khi số lần đánh giá fitness đạt `max_evals`."""
+    reason = "max_evals"
+
+    def __init__(self, max_evals):
+        self.max_evals = max_evals
+
+    def check(self, curve, n_evals, elapsed):
+        if n_evals >= self.max_evals:
+            return self.reason
+        return None
+
+
+class StopMonitor:
+    """
+    Gom nhiều điều kiện dừng; solver gọi check() sau mỗi vòng lặp.
+    stop: None, một điều kiện, hoặc danh sách điều kiện (dừng khi BẤT KỲ điều kiện nào thoả).
+    """
+
+    def __init__(self, stop=None):
+        if stop is None:
+            stop = []
+        elif not isinstance(stop, (list, tuple)):
+            stop = [stop]
+        self.criteria = list(stop)
+        self.start_time = time.perf_counter()
+        self.stop_reason = "max_iter"   # Giữ nguyên nếu chạy hết số vòng lặp
+
+    def check(self, curve, n_evals):
+        if not self.criteria:
+            return None
+        elapsed = time.perf_counter() - self.start_time
+        for criterion in self.criteria:
+            reason = criterion.check(curve, n_evals, elapsed)
+            if reason:
+                self.stop_reason = reason
+                return reason
+        return None
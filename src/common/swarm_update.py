@@ -0,0 +1,177 @@
+import numpy as np
+
+# ======================================================
+# CẬP NHẬT VỊ TRÍ BẦY SÓI (GWO POSITION UPDATE)
+# ======================================================
+def _gwo_estimate(X, leaders, a, r1, r2, A, T):
+    """
+    Lõi GWO dùng chung: T = X_leader - A * |C * X_leader - X| (ghi vào bộ đệm A, T).
+    Các tham số chỉ cần broadcast được với nhau; thứ tự phép tính giữ như bản gốc.
+    """
+    # A = 2 * a * r1 - a
+    np.multiply(r1, 2 * a, out=A)
+    np.subtract(A, a, out=A)
+    # D = |C * X_leader - X|, với C = 2 * r2
+    np.multiply(r2, 2, out=T)
+    np.multiply(T, leaders, out=T)
+    np.subtract(T, X, out=T)
+    np.abs(T, out=T)
+    # X_i = X_leader - A * D
+    np.multiply(A, T, out=T)
+    np.subtract(leaders, T, out=T)
+    return T
+
+
+def gwo_update_positions(Positions, Alpha_pos, Beta_pos, Delta_pos, a, rng=None, r=None):
+    """
+    Cập nhật vị trí của CẢ BẦY sói chỉ bằng vài phép toán mảng.
+
+    Positions: Ma trận vị trí (n_wolves x dim), được ghi đè tại chỗ.
+               Có thể có thêm trục lô phía trước: (S, n_wolves, dim).
+    Alpha_pos, Beta_pos, Delta_pos: Vị trí 3 con đầu đàn (dim,) hoặc (S, dim).
+    a: Tham số điều khiển (giảm từ 2 về 0).
+    rng: numpy.random.Generator dùng để rút hệ số.
+    r: Khối số ngẫu nhiên rút sẵn (n_wolves, dim, 3, 2); nếu có thì không cần rng.
+
+    Toàn bộ hệ số r1, r2 được rút MỘT lần dưới dạng tensor
+    (n_wolves, dim, 3, 2): trục thứ 3 là (Alpha, Beta, Delta), trục cuối là (r1, r2).
+    Thứ tự rút số ngẫu nhiên trùng với vòng lặp vô hướng cũ
+    (i -> j -> Alpha/Beta/Delta -> r1, r2) nên kết quả giống hệt bit-for-bit.
+    """
+    shape = Positions.shape
+
+    if r is None:
+        r = rng.random(shape + (3, 2))
+
+    # Ghép 3 con đầu đàn thành ma trận ([S,] 1, dim, 3) để broadcast với ([S,] n_wolves, dim, 3)
+    leaders = np.stack([Alpha_pos, Beta_pos, Delta_pos], axis=-1)[..., np.newaxis, :, :]
+
+    A = np.empty(shape + (3,))
+    X = np.empty(shape + (3,))
+    _gwo_estimate(Positions[..., np.newaxis], leaders, a, r[..., 0], r[..., 1], A, X)
+
+    # Vị trí mới là trung bình cộng của 3 vector hướng (cộng đúng thứ tự như bản cũ)
+    Positions[...] = (X[..., 0] + X[..., 1] + X[..., 2]) / 3
+    return Positions
+
+
+def gwo_update_positions_scalar(Positions, Alpha_pos, Beta_pos, Delta_pos, a, rng):
+    """
+    Bản vô hướng gốc (3 vòng lặp lồng nhau) - giữ lại để so sánh bit-for-bit
+    với gwo_update_positions(). Rất chậm, không dùng cho bài toán lớn.
+    """
+    n_wolves, dim = Positions.shape
+
+    for i in range(0, n_wolves):
+        for j in range(0, dim):
+
+            # Tính toán dựa trên Alpha
+            r1 = rng.random()
+            r2 = rng.random()
+            A1 = 2 * a * r1 - a
+            C1 = 2 * r2
+            D_alpha = abs(C1 * Alpha_pos[j] - Positions[i, j])
+            X1 = Alpha_pos[j] - A1 * D_alpha
+
+            # Tính toán dựa trên Beta
+            r1 = rng.random()
+            r2 = rng.random()
+            A2 = 2 * a * r1 - a
+            C2 = 2 * r2
+            D_beta = abs(C2 * Beta_pos[j] - Positions[i, j])
+            X2 = Beta_pos[j] - A2 * D_beta
+
+            # Tính toán dựa trên Delta
+            r1 = rng.random()
+            r2 = rng.random()
+            A3 = 2 * a * r1 - a
+            C3 = 2 * r2
+            D_delta = abs(C3 * Delta_pos[j] - Positions[i, j])
+            X3 = Delta_pos[j] - A3 * D_delta
+
+            # Vị trí mới
+            Positions[i, j] = (X1 + X2 + X3) / 3
+
+    return Positions
+
+
+# ======================================================
+# BƯỚC CẬP NHẬT HYBRID GWO-PSO CHO CẢ BẦY
+# ======================================================
+class HybridWorkspace:
+    """
+    Bộ đệm cấp phát sẵn cho hybrid_update(), tạo MỘT lần trước vòng lặp chính.
+
+    shape: Kích thước của Positions, (n_wolves, dim) hoặc (..., n_wolves, dim).
+    R có dạng (..., n_wolves, 4, 2, dim): 3 cặp (r1, r2) cho Alpha/Beta/Delta
+    và 1 cặp (r1_pso, r2_pso) - đúng thứ tự mà vòng lặp theo từng con sói cũ rút ra.
+    """
+
+    def __init__(self, shape):
+        *batch, n_wolves, dim = shape
+        batch = tuple(batch)
+        self.random_shape = batch + (n_wolves, 4, 2, dim)
+        self.R = None              # Chỉ cấp phát khi dùng fill_random (solver thường truyền R=)
+        self.A = np.empty(batch + (n_wolves, 3, dim))
+        self.T = np.empty(batch + (n_wolves, 3, dim))
+        self.X_gwo = np.empty(batch + (n_wolves, dim))
+        self.tmp = np.empty(batch + (n_wolves, dim))
+        self.tmp2 = np.empty(batch + (n_wolves, dim))
+
+    def fill_random(self, rng):
+        """Rút toàn bộ số ngẫu nhiên của một vòng lặp trong một lần gọi, ghi thẳng vào R."""
+        if self.R is None:
+            self.R = np.empty(self.random_shape)
+        rng.random(out=self.R)
+        return self.R
+
+
+def hybrid_update(Positions, Velocities, leader_pos, a, w_pso, c1, c2, lb, ub, ws, rng=None, R=None):
+    """
+    Một bước Hybrid GWO-PSO cho CẢ BẦY sói, ghi đè Positions và Velocities tại chỗ.
+
+    leader_pos: Vị trí Alpha, Beta, Delta (..., 3, dim).
+    w_pso, c1, c2: Tham số PSO; lb, ub: Giới hạn biên.
+    ws: HybridWorkspace cùng kích thước - mọi phép tính dùng out= trên bộ đệm này,
+        nên không cấp phát mảng tạm nào trong vòng lặp.
+    rng: numpy.random.Generator dùng để rút hệ số.
+    R: Khối số ngẫu nhiên rút sẵn (dạng ws.random_shape); nếu có thì không cần rng.
+    """
+    if R is None:
+        R = ws.fill_random(rng)
+    X = Positions
+
+    # ==========================================
+    # PHASE 1: GREY WOLF UPDATING (Tính X_GWO)
+    # ==========================================
+    T = _gwo_estimate(X[..., np.newaxis, :], leader_pos[..., np.newaxis, :, :], a,
+                      R[..., :3, 0, :], R[..., :3, 1, :], ws.A, ws.T)
+    X_gwo = ws.X_gwo
+    np.add(T[..., 0, :], T[..., 1, :], out=X_gwo)
+    np.add(X_gwo, T[..., 2, :], out=X_gwo)
+    np.divide(X_gwo, 3.0, out=X_gwo)
+
+    # ==========================================
+    # PHASE 2: PSO VELOCITY UPDATE (Tính X_PSO)
+    # ==========================================
+    # V = w*V + c1*r1*(Alpha - X) + c2*r2*(Beta - X)
+    tmp, tmp2 = ws.tmp, ws.tmp2
+    np.multiply(Velocities, w_pso, out=Velocities)
+    for leader, c, r in ((0, c1, R[..., 3, 0, :]), (1, c2, R[..., 3, 1, :])):
+        np.multiply(r, c, out=tmp)
+        np.subtract(leader_pos[..., leader:leader + 1, :], X, out=tmp2)
+        np.multiply(tmp, tmp2, out=tmp)
+        np.add(Velocities, tmp, out=Velocities)
+
+    # X_PSO = X + V
+    np.add(X, Velocities, out=tmp)
+
+    # ==========================================
+    # PHASE 3: HYBRID COMBINATION & BOUND CHECK
+    # ==========================================
+    # Kết hợp 50-50 rồi kiểm tra biên
+    np.multiply(X_gwo, 0.5, out=X_gwo)
+    np.multiply(tmp, 0.5, out=tmp)
+    np.add(X_gwo, tmp, out=X)
+    np.clip(X, lb, ub, out=X)
+    return Positions, Velocities
@@ -0,0 +1,187 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .fitness import batch_fitness
+from .leaders import init_leaders, select_leaders
+from .physics import get_steering_vector
+from .rng import RandomStream, resolve_rng
+from .seeding import initial_positions
+from .swarm_update import HybridWorkspace, hybrid_update
+
+# ==========================================
+# BÁM MỤC TIÊU THEO KHUNG (STREAMING TRACKING)
+# ==========================================
+# Góc mục tiêu trôi nhẹ giữa các khung. Thay vì giải lại từ đầu mỗi khung,
+# bầy sói, vận tốc và 3 con đầu đàn được GIỮ LẠI; mỗi khung chỉ:
+#   1. cập nhật các cột của A_targets có góc thay đổi,
+#   2. chấm điểm lại bầy + đầu đàn theo mục tiêu mới,
+#   3. kéo 3 đầu đàn theo góc mới bằng vài bước TS-ILS (refine_iters),
+#   4. chạy một số ít vòng Hybrid GWO-PSO (iters_per_frame)
+# -> thời gian mỗi khung bị chặn trên và gần như không đổi.
+
+@dataclass
+class TrackingFrame:
+    """Kết quả của một khung."""
+    frame: int
+    target_angles: np.ndarray     # Góc mục tiêu của khung (M,)
+    phases: np.ndarray            # Pha tốt nhất (N,), dùng ngay làm trọng số
+    score: float                  # Fitness của pha trên theo mục tiêu của khung
+    n_iter: int                   # Số vòng lặp đã chạy trong khung
+    n_evals: int                  # Số lần đánh giá fitness trong khung
+    elapsed: float                # Thời gian xử lý khung (giây)
+
+    @property
+    def weights(self):
+        return np.exp(1j * self.phases)
+
+
+class BeamTracker:
+    """
+    Hybrid GWO-PSO chạy liên tục qua các khung.
+
+        tracker = BeamTracker(64, n_wolves=30, iters_per_frame=5, rng=1)
+        for frame in tracker.track(angle_stream):     # angle_stream: iterable các bộ góc
+            apply(frame.weights)
+
+    iters_per_frame: Số vòng lặp mỗi khung (ngân sách cố định).
+    first_frame_iter: Số vòng lặp cho khung đầu (khởi động lạnh), None = iters_per_frame.
+    a_start: Giá trị a đầu mỗi khung, giảm tuyến tính về 0 trong khung
+             (nhỏ hơn 2 vì bầy đã ở gần nghiệm, chỉ cần khám phá cục bộ).
+    refine_iters: Số bước TS-ILS áp lên 3 đầu đàn đầu mỗi khung (bám theo góc dịch), 0 = tắt.
+    init: Khởi tạo bầy cho khung đầu (xem common/seeding.py), ví dụ "ts_ils".
+    Các khung có cùng số mục tiêu M; nếu M đổi thì A_targets được dựng lại toàn bộ.
+    """
+
+    def __init__(self, N, n_wolves=30, iters_per_frame=5, first_frame_iter=None, a_start=1.0,
+                 refine_iters=2, w_pso=0.5, c1=1.5, c2=1.5, gain=None, rng=None, rng_block=1,
+                 init=None):
+        self.N = N
+        self.n_wolves = n_wolves
+        self.iters_per_frame = iters_per_frame
+        self.first_frame_iter = iters_per_frame if first_frame_iter is None else first_frame_iter
+        self.a_start = a_start
+        self.refine_iters = refine_iters
+        self.w_pso, self.c1, self.c2 = w_pso, c1, c2
+        self.gain = N if gain is None else gain
+        self.init = init
+
+        self.dim = N
+        self.lb = 0
+        self.ub = 2 * np.pi
+
+        self.rng = resolve_rng(rng)
+        self.workspace = HybridWorkspace((n_wolves, N))
+        self.stream = RandomStream(self.rng, self.workspace.random_shape, rng_block)
+        self.target_angles = None
+        self.A_targets = None
+        self.d_mag = None
+        self.Positions = None
+        self.Velocities = np.zeros((n_wolves, N))
+        self.leader_pos, self.leader_scores = init_leaders(N)
+        self.frame = 0
+
+    def __call__(self, Positions):
+        """Fitness theo mục tiêu của khung hiện tại (tracker dùng được như một objective)."""
+        return batch_fitness(Positions, self.A_targets, self.d_mag)
+
+    def _update_targets(self, target_angles):
+        """
+        Chỉ tính lại các cột của A_targets có góc thay đổi; trả về số cột đã cập nhật.
+        Không dùng physics.steering_matrix: góc mỗi khung hầu như không lặp lại, lưu đệm
+        chỉ làm đầy bộ đệm dùng chung và đẩy các mục khác (lưới quét, pinv) ra ngoài.
+        """
+        if self.target_angles is None or len(target_angles) != len(self.target_angles):
+            self.A_targets = get_steering_vector(target_angles, self.N)
+            self.d_mag = np.full((len(target_angles), 1), float(self.gain))
+            changed = len(target_angles)
+        else:
+            moved = np.flatnonzero(target_angles != self.target_angles)
+            if len(moved):
+                self.A_targets[:, moved] = get_steering_vector(target_angles[moved], self.N)
+            changed = len(moved)
+        self.target_angles = target_angles
+        return changed
+
+    def _refine(self, phases, n_iter):
+        """
+        Vài bước TS-ILS bắt đầu từ các pha cho trước (k x N). Góc dịch làm pha tối ưu
+        đổi theo dạng dốc tuyến tính trên mảng, bước TS-ILS bám theo được trong khi
+        các bước bầy đàn thì khó; chi phí chỉ là nhân ma trận (M x N).
+        """
+        A_H = self.A_targets.conj().T
+        A_pinv = np.linalg.pinv(A_H)
+        W = np.exp(1j * phases).T                          # (N, k)
+        for _ in range(n_iter):
+            D = self.d_mag * np.exp(1j * np.angle(np.matmul(A_H, W)))
+            W = np.exp(1j * np.angle(np.matmul(A_pinv, D)))
+        return np.mod(np.angle(W.T), 2 * np.pi)
+
+    def _refine_leaders(self):
+        """
+        Thay TỪNG đầu đàn tại chỗ bằng bản TS-ILS của nó nếu tốt hơn hẳn, rồi sắp xếp lại.
+        Bản tinh chỉnh trùng với một đầu đàn khác thì bỏ qua, để Alpha/Beta/Delta
+        không bị gộp thành một điểm (GWO khi đó chỉ còn một đầu đàn).
+        """
+        refined = self._refine(self.leader_pos, self.refine_iters)
+        scores = self(refined)
+        for k in range(3):
+            if not scores[k] < self.leader_scores[k]:
+                continue
+            others = np.delete(self.leader_pos, k, axis=0)
+            if np.any(np.all(np.isclose(others, refined[k]), axis=-1)):
+                continue
+            self.leader_pos[k] = refined[k]
+            self.leader_scores[k] = scores[k]
+        order = np.argsort(self.leader_scores, kind="stable")
+        self.leader_pos, self.leader_scores = self.leader_pos[order], self.leader_scores[order]
+
+    def step(self, target_angles):
+        """Xử lý một khung với bộ góc mới; trả về TrackingFrame."""
+        start = time.perf_counter()
+        # Sao chép: nguồn góc có thể dùng lại một bộ đệm và sửa tại chỗ giữa các khung
+        self._update_targets(np.array(target_angles, dtype=float).ravel())
+        n_evals = 0
+
+        if self.Positions is None:
+            self.Positions, n_evals = initial_positions(self.init, self, self.n_wolves, self.dim,
+                                                        self.lb, self.ub, self.rng)
+            n_iter = self.first_frame_iter
+        else:
+            # Đầu đàn cũ được chấm lại theo mục tiêu mới (điểm cũ không còn đúng)
+            self.leader_scores = self(self.leader_pos)
+            n_evals += 3
+            n_iter = self.iters_per_frame
+
+        fitness_values = self(self.Positions)
+        n_evals += self.n_wolves
+        self.leader_pos, self.leader_scores = select_leaders(fitness_values, self.Positions,
+                                                             self.leader_pos, self.leader_scores)
+        if self.refine_iters:
+            self._refine_leaders()
+            n_evals += 3 * (self.refine_iters + 1)
+
+        for l in range(n_iter):
+            a = self.a_start * (1 - l / n_iter)
+            hybrid_update(self.Positions, self.Velocities, self.leader_pos, a, self.w_pso, self.c1,
+                          self.c2, self.lb, self.ub, self.workspace, R=self.stream.next())
+            fitness_values = self(self.Positions)
+            n_evals += self.n_wolves
+            self.leader_pos, self.leader_scores = select_leaders(fitness_values, self.Positions,
+                                                                 self.leader_pos, self.leader_scores)
+
+        self.frame += 1
+        return TrackingFrame(self.frame, self.target_angles.copy(), self.leader_pos[0].copy(),
+                             float(self.leader_scores[0]), n_iter, n_evals,
+                             time.perf_counter() - start)
+
+    def track(self, angle_stream):
+        """Generator: nhận lần lượt các bộ góc, trả về TrackingFrame cho từng khung."""
+        for target_angles in angle_stream:
+            yield self.step(target_angles)
+
+
+def track(N, angle_stream, **options):
+    """Rút gọn của BeamTracker(N, **options).track(angle_stream)."""
+    return BeamTracker(N, **options).track(angle_stream)
@@ -0,0 +1,81 @@
+import numpy as np
+
+from .profiling import NULL_PROFILER
+from .rng import resolve_rng
+
+# ==========================================
+# TS-ILS THEO LÔ (NHIỀU LẦN KHỞI TẠO / NHIỀU KỊCH BẢN)
+# ==========================================
+def ts_ils_batch(A_targets, d_mag, n_starts=1, max_iter=50, A_pinv=None, rng=None, callback=None,
+                 profiler=NULL_PROFILER):
+    """
+    Chạy TS-ILS cho nhiều lần khởi tạo ngẫu nhiên (và nhiều kịch bản cùng M) trong một lượt.
+
+    A_targets: Ma trận lái (N x M) hoặc chồng nhiều kịch bản (S x N x M).
+    d_mag: Biên độ mong muốn (M x 1 / M,) hoặc (S x M).
+    n_starts: Số lần khởi tạo ngẫu nhiên K chạy song song cho mỗi kịch bản.
+    A_pinv: pinv(A^H) tính sẵn (ví dụ physics.steering_pinv); nếu None thì
+            tính MỘT lần ở đây và dùng lại cho mọi vòng lặp.
+    rng: numpy.random.Generator cho pha khởi tạo (None -> Generator mới).
+    callback: Hàm callback(curve, n_evals) gọi sau mỗi vòng lặp; curve là đường
+              "sai số tốt nhất" (tốt nhất theo lần khởi tạo, xấu nhất theo kịch bản).
+              Trả về giá trị đúng (ví dụ lý do từ StopMonitor.check) -> dừng sớm.
+    profiler: common.profiling.Profiler (pha "rng", "fitness", "update").
+
+    Trả về:
+        w_best: Trọng số tốt nhất của mỗi kịch bản (N,) hoặc (S x N).
+        best_error: Sai số tương ứng () hoặc (S,).
+        cost_history: Sai số theo vòng lặp (n_iter + 1, [S,] K), hàng 0 là lúc khởi tạo.
+    """
+    A_targets = np.asarray(A_targets)
+    N, M = A_targets.shape[-2:]
+    batch_shape = A_targets.shape[:-2]
+
+    A_H = np.swapaxes(A_targets.conj(), -1, -2)          # ([S,] M, N)
+    if A_pinv is None:
+        A_pinv = np.linalg.pinv(A_H)                      # ([S,] N, M), chỉ tính 1 lần
+    d = np.reshape(d_mag, batch_shape + (M, 1))
+
+    # Khởi tạo ngẫu nhiên: mỗi cột là một lần khởi tạo
+    with profiler.phase("rng"):
+        phi = resolve_rng(rng).random(batch_shape + (N, n_starts)) * 2 * np.pi
+    profiler.count("rng_draws", phi.size)
+    W = np.exp(1j * phi)                                  # ([S,] N, K)
+
+    # --- SAI SỐ BAN ĐẦU (VÒNG 0) ---
+    with profiler.phase("fitness"):
+        Y = np.matmul(A_H, W)                             # ([S,] M, K)
+        errors = np.linalg.norm(np.abs(Y) - d, axis=-2)
+    profiler.count("fitness_calls")
+    cost_history = [errors]
+    best_curve = [float(np.max(np.min(errors, axis=-1)))]
+    n_evals = errors.size
+
+    # --- VÒNG LẶP ---
+    for _ in range(max_iter):
+        with profiler.phase("update"):
+            # Bước 1: giữ biên độ mong muốn, lấy pha từ phản hồi hiện tại
+            D = d * np.exp(1j * np.angle(Y))
+            # Bước 2: bình phương tối thiểu rồi chiếu về mô-đun 1
+            W = np.exp(1j * np.angle(np.matmul(A_pinv, D)))
+
+        # Phản hồi mới dùng luôn cho vòng sau (không cần nhân lại)
+        with profiler.phase("fitness"):
+            Y = np.matmul(A_H, W)
+            errors = np.linalg.norm(np.abs(Y) - d, axis=-2)
+        profiler.count("fitness_calls")
+        cost_history.append(errors)
+
+        # Báo tiến trình / dừng sớm
+        if callback is not None:
+            best_curve.append(float(np.max(np.min(errors, axis=-1))))
+            n_evals += errors.size
+            if callback(best_curve, n_evals):
+                break
+
+    # Chọn lần khởi tạo tốt nhất cho từng kịch bản
+    best = np.argmin(errors, axis=-1)                     # ([S],)
+    w_best = np.take_along_axis(W, best[..., np.newaxis, np.newaxis], axis=-1)[..., 0]
+    best_error = np.take_along_axis(errors, best[..., np.newaxis], axis=-1)[..., 0]
+    profiler.count("fitness_evals", errors.size * len(cost_history))
+    return w_best, best_error, np.stack(cost_history)
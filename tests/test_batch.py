@@ -0,0 +1,22 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+from common.batch import solve_batch
+from common.stopping import TargetError
+
+TARGET_SETS = [[0, -40], [10, -20], [30, 45], [-15, 5]]
+
+
+@pytest.mark.parametrize("name", ["gwo", "gwo_pso", "ts_ils"])
+def test_chunks_with_early_stop(name):
+    """Các lượt dừng ở vòng lặp khác nhau vẫn ghép được đường hội tụ (S cột)."""
+    options = {"n_starts": 2} if name == "ts_ils" else {"n_wolves": 10}
+    result = solve_batch(name, 16, TARGET_SETS, chunk_size=2, rng=0, max_iter=30,
+                         stop=TargetError(14.0), **options)
+    assert result.convergence.shape[1] == len(TARGET_SETS)
+    assert np.all(np.isfinite(result.convergence))
+    assert np.allclose(result.convergence[-1], result.best_scores)